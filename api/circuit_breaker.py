@@ -0,0 +1,95 @@
+import threading
+import urllib.request
+
+CIRCUIT_OPEN_MESSAGE = (
+    "Error: The local server is not responding. "
+    "ChatBar will reconnect automatically once it is back."
+)
+
+
+def probe_server(base_url, timeout):
+    """Returns True if the server answers GET /models within `timeout` seconds."""
+    try:
+        with urllib.request.urlopen(base_url.rstrip("/") + "/models", timeout=timeout) as response:
+            return response.status == 200
+    except Exception:
+        return False
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a backend after repeated failures.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests are refused immediately. While open, a background thread calls
+    `probe` every `probe_interval` seconds and closes the circuit as soon as
+    the backend answers again. `pause()` stops probing, for example while
+    the app is idle, until `resume()`.
+    """
+    def __init__(self, probe, failure_threshold=3, probe_interval=5.0):
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.failures = 0
+        self._open = False
+        self._paused = False
+        self._lock = threading.Lock()
+        self._stop_probing = threading.Event()
+
+    @property
+    def is_open(self):
+        return self._open
+
+    def allow_request(self):
+        """Returns False while the circuit is open."""
+        return not self._open
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._open or self.failures < self.failure_threshold:
+                return
+            self._open = True
+            if not self._paused:
+                self._start_probing()
+        print(f"Circuit opened after {self.failures} failures; probing in the background.")
+
+    def _start_probing(self):
+        # Each probe thread gets its own stop event, so a paused thread that
+        # has not woken up yet cannot be revived by a later resume().
+        self._stop_probing = threading.Event()
+        threading.Thread(
+            target=self._probe_loop, args=(self._stop_probing,), name="CircuitProbe", daemon=True
+        ).start()
+
+    def pause(self):
+        """Stops background probing; the circuit stays open or closed as it is."""
+        with self._lock:
+            self._paused = True
+            self._stop_probing.set()
+
+    def resume(self):
+        """Restarts background probing if the circuit is open."""
+        with self._lock:
+            if not self._paused:
+                return
+            self._paused = False
+            if self._open:
+                self._start_probing()
+
+    def close(self):
+        """Closes the circuit and stops any background probing."""
+        with self._lock:
+            self._open = False
+            self.failures = 0
+            self._stop_probing.set()
+
+    def _probe_loop(self, stop):
+        while not stop.wait(self.probe_interval):
+            if self.probe():
+                print("Local server is reachable again; circuit closed.")
+                self.close()
@@ -1,26 +1,62 @@
+import httpx
+from openai import OpenAI, APIConnectionError, APITimeoutError
 
-from openai import OpenAI
+from api.circuit_breaker import CIRCUIT_OPEN_MESSAGE, CircuitBreaker, probe_server
+from api.messages import build_messages
 
 class LocalAIClient:
     """
     A client for interacting with a local OpenAI-compatible server.
+
+    `connect_timeout` bounds opening the connection, `first_token_timeout`
+    bounds the wait for the response to start and `chunk_timeout` the gap
+    between chunks. The SDK applies a single read timeout per request, so the
+    larger of the last two is used for every read.
     """
-    def __init__(self, base_url="http://127.0.0.1:1234/v1"):
-        self.client = OpenAI(base_url=base_url, api_key="not-needed")
+    def __init__(self, base_url="http://127.0.0.1:1234/v1", connect_timeout=2.0,
+                 first_token_timeout=30.0, chunk_timeout=10.0, breaker=None,
+                 retriever=None):
+        read_timeout = max(first_token_timeout, chunk_timeout)
+        self.client_options = dict(
+            base_url=base_url,
+            api_key="not-needed",
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            max_retries=0,
+        )
+        self.client = OpenAI(**self.client_options)
         self.model = "llama-3.2-1b-instruct"
+        self.breaker = breaker or CircuitBreaker(
+            probe=lambda: probe_server(base_url, connect_timeout)
+        )
+        self.retriever = retriever
+
+    def release_idle(self):
+        """Closes pooled connections; a new pool connects lazily on the next request."""
+        self.client.close()
+        self.client = OpenAI(**self.client_options)
+        if self.retriever:
+            self.retriever.release_idle()
+
+    def shutdown(self):
+        """Stops background indexing. Safe to call from any thread."""
+        if self.retriever:
+            self.retriever.shutdown()
 
-    def get_streaming_response(self, prompt: str):
+    def get_streaming_response(self, prompt: str, model=None):
         """
         Sends a prompt to the server and yields the response chunks.
+        `model` overrides the client's default model for this request.
         """
-        messages = [
-            {"role": "system", "content": "You are a helpful assistant."},
-            {"role": "user", "content": prompt},
-        ]
+        if not self.breaker.allow_request():
+            yield CIRCUIT_OPEN_MESSAGE
+            return
+
+        context = self.retriever.retrieve(prompt) if self.retriever else None
+        messages = build_messages(prompt, context)
 
         try:
             stream = self.client.chat.completions.create(
-                model=self.model,
+                model=model or self.model,
                 messages=messages,
                 temperature=0.7,
                 stream=True,
@@ -29,6 +65,16 @@ class LocalAIClient:
                 content = chunk.choices[0].delta.content
                 if content:
                     yield content
+            self.breaker.record_success()
+        except (APITimeoutError, httpx.TimeoutException) as e:
+            print(f"Local AI server timed out: {e}")
+            self.breaker.record_failure()
+            yield "Error: The local server stopped responding."
+        except (APIConnectionError, httpx.TransportError) as e:
+            print(f"Error connecting to local AI server: {e}")
+            self.breaker.record_failure()
+            yield "Error: Could not connect to the local server. Please ensure it's running."
         except Exception as e:
+            # Not a transport problem (e.g. a bad request), so the breaker is left alone.
             print(f"Error connecting to local AI server: {e}")
             yield "Error: Could not connect to the local server. Please ensure it's running."
@@ -0,0 +1,22 @@
+SYSTEM_PROMPT = "You are a helpful assistant."
+
+
+CONTEXT_PROMPT = (
+    "Use the following excerpts from the user's documents when they are "
+    "relevant to the question. Mention the file name when you rely on one."
+)
+
+
+def build_messages(prompt: str, context=None):
+    """
+    Builds the chat messages sent to the server for a single prompt.
+    `context` is an optional list of {"file", "text"} document excerpts.
+    """
+    system = SYSTEM_PROMPT
+    if context:
+        excerpts = "\n\n".join(f"[{chunk['file']}]\n{chunk['text']}" for chunk in context)
+        system = f"{SYSTEM_PROMPT}\n\n{CONTEXT_PROMPT}\n\n{excerpts}"
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": prompt},
+    ]
@@ -0,0 +1,57 @@
+import gc
+import socket
+
+from api.shm_ring import CHUNK, END, ERROR, ChunkRing
+
+
+def notify(sock):
+    """Wakes the GUI process. A full socket buffer means a wakeup is already pending."""
+    try:
+        sock.send(b"\0")
+    except (BlockingIOError, socket.timeout):
+        pass
+
+
+def run_client_process(requests, ring_name, notify_sock, client_factory):
+    """
+    Entry point of the network process.
+
+    Receives ("prompt", text) messages over the `requests` pipe, streams
+    them with the client built by `client_factory`, and writes the decoded
+    chunks into the shared ChunkRing, poking `notify_sock` after each record.
+    ("release_idle",) drops idle connections, pauses circuit breaker probing
+    and collects garbage, ("rehydrate",) resumes probing; `None` exits.
+    """
+    ring = ChunkRing(name=ring_name)
+    notify_sock.setblocking(False)
+    client = client_factory()
+    try:
+        while True:
+            message = requests.recv()
+            if message is None:
+                break
+            if message[0] == "release_idle":
+                client.release_idle()
+                client.breaker.pause()
+                gc.collect()
+                continue
+            if message[0] == "rehydrate":
+                client.breaker.resume()
+                continue
+            prompt = message[1]
+            try:
+                for chunk in client.get_streaming_response(prompt):
+                    if not ring.write(CHUNK, chunk):
+                        raise RuntimeError("GUI process stopped reading the response")
+                    notify(notify_sock)
+                ring.write(END)
+            except Exception as e:
+                ring.write(ERROR, f"An unexpected error occurred: {e}")
+            notify(notify_sock)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        # Otherwise the interpreter waits for every queued document to be embedded.
+        client.shutdown()
+        ring.close()
+        notify_sock.close()
@@ -0,0 +1,168 @@
+import http.client
+import json
+import socket
+from urllib.parse import urlsplit
+
+from api.circuit_breaker import CIRCUIT_OPEN_MESSAGE, CircuitBreaker, probe_server
+from api.messages import build_messages
+
+_DATA_PREFIX = b"data:"
+_DONE = b"[DONE]"
+
+
+class RawStreamClient:
+    """
+    A lightweight client that speaks the OpenAI-compatible streaming protocol
+    directly over a single keep-alive HTTP connection.
+
+    Only the delta text is pulled out of each server-sent event, so no SDK
+    objects are built per chunk. The interface matches LocalAIClient.
+
+    `first_token_timeout` bounds the wait until the first chunk of text and
+    `chunk_timeout` every gap after that, each as a socket read timeout.
+    """
+    def __init__(self, base_url="http://127.0.0.1:1234/v1", connect_timeout=2.0,
+                 first_token_timeout=30.0, chunk_timeout=10.0, breaker=None,
+                 retriever=None):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "http"
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port
+        self.path = parts.path.rstrip("/") + "/chat/completions"
+        self.model = "llama-3.2-1b-instruct"
+        self.connection = None
+        self.connect_timeout = connect_timeout
+        self.first_token_timeout = first_token_timeout
+        self.chunk_timeout = chunk_timeout
+        self.breaker = breaker or CircuitBreaker(
+            probe=lambda: probe_server(base_url, connect_timeout)
+        )
+        self.retriever = retriever
+
+    def _get_connection(self):
+        """Returns the pooled connection, opening it if needed."""
+        if self.connection is None:
+            if self.scheme == "https":
+                self.connection = http.client.HTTPSConnection(
+                    self.host, self.port, timeout=self.connect_timeout
+                )
+            else:
+                self.connection = http.client.HTTPConnection(
+                    self.host, self.port, timeout=self.connect_timeout
+                )
+        return self.connection
+
+    def close(self):
+        """Closes the pooled connection."""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def release_idle(self):
+        """Closes the pooled connection; it reconnects on the next request."""
+        self.close()
+        if self.retriever:
+            self.retriever.release_idle()
+
+    def shutdown(self):
+        """Stops background indexing. Safe to call from any thread."""
+        if self.retriever:
+            self.retriever.shutdown()
+
+    def _open_stream(self, body):
+        """
+        Sends the request, reconnecting once if the pooled socket went stale.
+        Returns (response, socket).
+        """
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream",
+            "Connection": "keep-alive",
+        }
+        for attempt in range(2):
+            conn = self._get_connection()
+            try:
+                conn.request("POST", self.path, body=body, headers=headers)
+                # Connected: from here on the wait is for the model to start answering.
+                # getresponse() drops conn.sock on `Connection: close` or HTTP/1.0
+                # replies, while the response keeps reading from this socket.
+                sock = conn.sock
+                sock.settimeout(self.first_token_timeout)
+                return conn.getresponse(), sock
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                # The server dropped the idle keep-alive connection; retry on a fresh one.
+                self.close()
+                if attempt:
+                    raise
+
+    def iter_deltas(self, response):
+        """Yields the delta text of each `data:` line in an SSE response."""
+        loads = json.loads
+        readline = response.readline
+        while True:
+            line = readline()
+            if not line:
+                return
+            if not line.startswith(_DATA_PREFIX):
+                continue
+            payload = line[5:].strip()
+            if payload == _DONE:
+                return
+            if not payload:
+                continue
+            choices = loads(payload).get("choices")
+            if choices:
+                content = choices[0].get("delta", {}).get("content")
+                if content:
+                    yield content
+
+    def get_streaming_response(self, prompt: str, model=None):
+        """
+        Sends a prompt to the server and yields the response chunks.
+        `model` overrides the client's default model for this request.
+        """
+        if not self.breaker.allow_request():
+            yield CIRCUIT_OPEN_MESSAGE
+            return
+
+        context = self.retriever.retrieve(prompt) if self.retriever else None
+        body = json.dumps({
+            "model": model or self.model,
+            "messages": build_messages(prompt, context),
+            "temperature": 0.7,
+            "stream": True,
+        })
+
+        finished = False
+        try:
+            response, sock = self._open_stream(body)
+            if response.status != 200:
+                raise RuntimeError(
+                    f"HTTP {response.status}: {response.read(512).decode('utf-8', 'replace')}"
+                )
+            first = True
+            for content in self.iter_deltas(response):
+                if first:
+                    sock.settimeout(self.chunk_timeout)
+                    first = False
+                yield content
+            # Drain the rest of the body so the connection can be reused.
+            response.read()
+            finished = True
+            self.breaker.record_success()
+        except socket.timeout as e:
+            print(f"Local AI server timed out: {e}")
+            self.breaker.record_failure()
+            yield "Error: The local server stopped responding."
+        except (OSError, http.client.HTTPException) as e:
+            print(f"Error connecting to local AI server: {e}")
+            self.breaker.record_failure()
+            yield "Error: Could not connect to the local server. Please ensure it's running."
+        except Exception as e:
+            # Not a transport problem (e.g. a malformed event), so the breaker is left alone.
+            print(f"Error connecting to local AI server: {e}")
+            yield "Error: Could not connect to the local server. Please ensure it's running."
+        finally:
+            if not finished:
+                # A partially read response cannot be reused for the next request.
+                self.close()
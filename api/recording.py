@@ -0,0 +1,150 @@
+import json
+import os
+import struct
+import time
+from datetime import datetime
+
+from api.circuit_breaker import CircuitBreaker
+
+# File layout: MAGIC, a 4-byte length and a JSON header ({"prompt", "model",
+# "recorded_at", "chunks"}), then per chunk a 4-byte delay in microseconds
+# since the previous chunk (or since the request for the first one), a
+# 4-byte length and the UTF-8 text.
+MAGIC = b"CBRS\x01"
+_LENGTH = struct.Struct("<I")
+_CHUNK = struct.Struct("<II")
+EXTENSION = ".cbr"
+
+
+def write_recording(path, chunks, prompt="", model=None):
+    """Writes a list of (delay_seconds, text) chunks to `path`."""
+    header = json.dumps({
+        "prompt": prompt,
+        "model": model,
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "chunks": len(chunks),
+    }).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_LENGTH.pack(len(header)))
+        f.write(header)
+        for delay, text in chunks:
+            data = text.encode("utf-8")
+            f.write(_CHUNK.pack(min(int(delay * 1_000_000), 0xFFFFFFFF), len(data)))
+            f.write(data)
+
+
+def read_recording(path):
+    """Returns (header dict, list of (delay_seconds, text))."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a ChatBar stream recording")
+    offset = len(MAGIC)
+    (header_length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    header = json.loads(data[offset:offset + header_length])
+    offset += header_length
+
+    chunks = []
+    while offset < len(data):
+        delay_us, length = _CHUNK.unpack_from(data, offset)
+        offset += _CHUNK.size
+        chunks.append((delay_us / 1_000_000, data[offset:offset + length].decode("utf-8")))
+        offset += length
+    return header, chunks
+
+
+class StreamRecorder:
+    """
+    Wraps a client and saves every successful stream, with its inter-chunk
+    timing, as a recording in `directory`. Streams pass through unchanged.
+    """
+    def __init__(self, client, directory):
+        self.client = client
+        self.breaker = client.breaker
+        self.directory = os.path.expanduser(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.last_path = None
+
+    def release_idle(self):
+        self.client.release_idle()
+
+    def shutdown(self):
+        self.client.shutdown()
+
+    def get_streaming_response(self, prompt: str, model=None):
+        """
+        Sends a prompt through the wrapped client, yielding and recording the response chunks.
+        """
+        chunks = []
+        last = time.perf_counter()
+        for chunk in self.client.get_streaming_response(prompt, model=model):
+            now = time.perf_counter()
+            chunks.append((now - last, chunk))
+            last = now
+            yield chunk
+
+        # Clients report failures as an "Error:" chunk, which may follow partial text.
+        if not chunks or any(chunk.startswith("Error:") for _, chunk in chunks):
+            return
+        name = datetime.now().strftime("stream-%Y%m%d-%H%M%S-%f") + EXTENSION
+        self.last_path = os.path.join(self.directory, name)
+        try:
+            write_recording(self.last_path, chunks, prompt, model)
+        except OSError as e:
+            print(f"Failed to save stream recording: {e}")
+
+
+class ReplayClient:
+    """
+    Plays recorded streams back through the LocalAIClient interface.
+
+    `path` is a recording or a directory of them; a directory is replayed in
+    name order, one recording per request, wrapping around at the end. With
+    `speed` 1.0 chunks arrive with their original timing, 2.0 twice as fast,
+    and 0 as fast as possible. The prompt is ignored.
+    """
+    def __init__(self, path, speed=1.0):
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            self.paths = sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith(EXTENSION)
+            )
+        else:
+            self.paths = [path]
+        if not self.paths:
+            raise ValueError(f"no recordings found in {path}")
+        self.speed = speed
+        self.next_index = 0
+        self.breaker = CircuitBreaker(probe=lambda: True)
+
+    def release_idle(self):
+        pass
+
+    def shutdown(self):
+        pass
+
+    def get_streaming_response(self, prompt: str, model=None):
+        """
+        Yields the next recording's chunks on its original (scaled) schedule.
+        """
+        path = self.paths[self.next_index % len(self.paths)]
+        self.next_index += 1
+        try:
+            _, chunks = read_recording(path)
+        except (OSError, ValueError) as e:
+            print(f"Failed to load stream recording: {e}")
+            yield "Error: Could not load the stream recording."
+            return
+
+        start = time.perf_counter()
+        elapsed = 0.0
+        for delay, text in chunks:
+            if self.speed > 0:
+                # Schedule against the start time so sleep overshoot does not accumulate.
+                elapsed += delay / self.speed
+                remaining = start + elapsed - time.perf_counter()
+                if remaining > 0:
+                    time.sleep(remaining)
+            yield text
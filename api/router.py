@@ -0,0 +1,146 @@
+import re
+import threading
+import time
+
+# `!big` / `!small` followed by whitespace or the end of the prompt.
+PREFIX_PATTERN = re.compile(r"!(big|small)(?=\s|$)", re.IGNORECASE)
+
+# Words that usually mean the question needs more than a quick answer.
+DEFAULT_KEYWORDS = (
+    "explain", "why", "prove", "derive", "compare", "analyze", "analyse",
+    "implement", "debug", "refactor", "algorithm", "step by step", "design",
+)
+
+# Phrases a small model tends to produce when it is out of its depth.
+INSUFFICIENT_PHRASES = (
+    "i don't know", "i do not know", "i'm not sure", "i am not sure",
+    "i cannot answer", "i can't answer", "i'm unable to", "i am unable to",
+)
+
+ESCALATION_NOTE = "\n\n---\n*Escalating to a larger model...*\n\n"
+
+
+class ModelStats:
+    """Latency and throughput counters for one model."""
+    def __init__(self):
+        self.requests = 0
+        self.first_token_total = 0.0
+        self.stream_total = 0.0
+        self.chars = 0
+
+    def record(self, first_token, duration, chars):
+        self.requests += 1
+        self.first_token_total += first_token
+        self.stream_total += duration
+        self.chars += chars
+
+    def summary(self):
+        """Returns the average time to first token, stream time and chars/second."""
+        if not self.requests:
+            return {"requests": 0}
+        return {
+            "requests": self.requests,
+            "avg_first_token_ms": self.first_token_total / self.requests * 1000,
+            "avg_stream_ms": self.stream_total / self.requests * 1000,
+            "chars_per_sec": self.chars / self.stream_total if self.stream_total else 0.0,
+        }
+
+
+class CascadeClient:
+    """
+    Routes each prompt to a small or a large model.
+
+    Prompts are classified cheaply: a `!big` / `!small` prefix wins, otherwise
+    long prompts, code and prompts containing one of `keywords` go to the
+    large model. With `escalate` enabled, a small-model answer that looks
+    insufficient is followed by the large model's answer in the same stream.
+    Wraps any client with the LocalAIClient interface.
+    """
+    def __init__(self, client, small_model, large_model, escalate=False,
+                 long_prompt_chars=400, keywords=DEFAULT_KEYWORDS):
+        self.client = client
+        self.breaker = client.breaker
+        self.small_model = small_model
+        self.large_model = large_model
+        self.escalate = escalate
+        self.long_prompt_chars = long_prompt_chars
+        self.keyword_pattern = re.compile(
+            r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b", re.IGNORECASE
+        )
+        self.stats = {small_model: ModelStats(), large_model: ModelStats()}
+        self._stats_lock = threading.Lock()
+
+    def classify(self, prompt):
+        """
+        Returns (model, prompt, forced) where `prompt` has any routing prefix
+        removed and `forced` says the user picked the model explicitly.
+        """
+        stripped = prompt.lstrip()
+        prefix = PREFIX_PATTERN.match(stripped)
+        if prefix:
+            model = self.large_model if prefix.group(1).lower() == "big" else self.small_model
+            return model, stripped[prefix.end():].lstrip(), True
+
+        if (len(prompt) >= self.long_prompt_chars
+                or "```" in prompt
+                or self.keyword_pattern.search(prompt)):
+            return self.large_model, prompt, False
+        return self.small_model, prompt, False
+
+    def is_insufficient(self, answer):
+        """
+        Heuristic check for a small-model answer that should be escalated:
+        an empty answer or one that admits it does not know. Short answers
+        are fine, since quick factual prompts are what the small model is for.
+        """
+        text = answer.strip().lower()
+        if not text:
+            return True
+        return any(phrase in text for phrase in INSUFFICIENT_PHRASES)
+
+    def _stream(self, prompt, model):
+        """Streams from `model`, recording its stats. Returns the full answer."""
+        parts = []
+        start = time.perf_counter()
+        first_token = None
+        for chunk in self.client.get_streaming_response(prompt, model=model):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            parts.append(chunk)
+            yield chunk
+        answer = "".join(parts)
+        if not answer.startswith("Error:"):
+            duration = time.perf_counter() - start
+            with self._stats_lock:
+                self.stats.setdefault(model, ModelStats()).record(
+                    first_token or duration, duration, len(answer)
+                )
+        return answer
+
+    def get_streaming_response(self, prompt: str, model=None):
+        """
+        Sends a prompt to the routed model and yields the response chunks.
+        An explicit `model` skips routing.
+        """
+        if model is not None:
+            yield from self._stream(prompt, model)
+            return
+
+        model, prompt, forced = self.classify(prompt)
+        answer = yield from self._stream(prompt, model)
+
+        if (self.escalate and not forced and model == self.small_model
+                and not answer.startswith("Error:") and self.is_insufficient(answer)):
+            yield ESCALATION_NOTE
+            yield from self._stream(prompt, self.large_model)
+
+    def release_idle(self):
+        self.client.release_idle()
+
+    def shutdown(self):
+        self.client.shutdown()
+
+    def stats_summary(self):
+        """Returns {model: summary dict} for every model used so far."""
+        with self._stats_lock:
+            return {name: stats.summary() for name, stats in self.stats.items()}
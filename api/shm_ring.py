@@ -0,0 +1,102 @@
+import struct
+import time
+from multiprocessing import shared_memory
+
+# Header: write position, read position (both monotonically increasing byte
+# offsets), followed by the data area. Each record is a 4-byte length, a
+# 1-byte kind and the UTF-8 payload. A record never wraps: if it does not fit
+# before the end of the data area, a WRAP record pads to the end.
+_HEADER = struct.Struct("<QQ")
+_RECORD = struct.Struct("<IB")
+
+CHUNK = 0
+END = 1
+ERROR = 2
+_WRAP = 255
+
+
+class ChunkRing:
+    """
+    A single-producer, single-consumer ring buffer of text records in shared
+    memory, used to hand streamed chunks from the network process to the GUI
+    process without pickling them through a pipe.
+
+    Create it with `ChunkRing(size=...)` in one process and attach to it with
+    `ChunkRing(name=ring.name)` in the other.
+    """
+    def __init__(self, name=None, size=1 << 20):
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + size)
+            _HEADER.pack_into(self.shm.buf, 0, 0, 0)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        self.capacity = self.shm.size - _HEADER.size
+
+    def _positions(self):
+        return _HEADER.unpack_from(self.buf, 0)
+
+    def write(self, kind, text="", timeout=5.0):
+        """
+        Appends one record. Blocks while the ring is full, up to `timeout`
+        seconds, and returns False if the consumer never made room.
+        """
+        payload = text.encode("utf-8")
+        needed = _RECORD.size + len(payload)
+        if needed + _RECORD.size > self.capacity:
+            raise ValueError(f"record of {needed} bytes does not fit a {self.capacity} byte ring")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            write_pos, read_pos = self._positions()
+            offset = write_pos % self.capacity
+            pad = self.capacity - offset if offset + needed > self.capacity else 0
+            if write_pos + pad + needed - read_pos <= self.capacity:
+                break
+            if time.monotonic() > deadline:
+                return False
+            time.sleep(0.0005)
+
+        base = _HEADER.size
+        if pad:
+            if pad >= _RECORD.size:
+                _RECORD.pack_into(self.buf, base + offset, 0, _WRAP)
+            write_pos += pad
+            offset = 0
+        _RECORD.pack_into(self.buf, base + offset, len(payload), kind)
+        start = base + offset + _RECORD.size
+        self.buf[start:start + len(payload)] = payload
+        # Publish only after the record is fully written.
+        struct.pack_into("<Q", self.buf, 0, write_pos + needed)
+        return True
+
+    def read_all(self):
+        """Returns every unread record as a list of (kind, text)."""
+        records = []
+        write_pos, read_pos = self._positions()
+        base = _HEADER.size
+        while read_pos < write_pos:
+            offset = read_pos % self.capacity
+            if self.capacity - offset < _RECORD.size:
+                read_pos += self.capacity - offset
+                continue
+            length, kind = _RECORD.unpack_from(self.buf, base + offset)
+            if kind == _WRAP:
+                read_pos += self.capacity - offset
+                continue
+            start = base + offset + _RECORD.size
+            # Decode straight out of shared memory; the str is the only copy.
+            records.append((kind, str(self.buf[start:start + length], "utf-8")))
+            read_pos += _RECORD.size + length
+        struct.pack_into("<Q", self.buf, 8, read_pos)
+        return records
+
+    def close(self):
+        """Detaches from the shared memory, and frees it if this side created it."""
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -1,7 +1,8 @@
 import sys
 import os
+import multiprocessing
 from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import QObject, pyqtSignal, QThread, pyqtSlot, QTimer
+from PyQt5.QtCore import pyqtSignal, Qt, QThread, QTimer
 from PyQt5.QtGui import QWindow
 from pynput import keyboard
 
@@ -18,29 +19,12 @@ if sys.platform == "win32":
     SWP_NOSIZE = 0x0001
     SWP_SHOWWINDOW = 0x0040
 
+import config
+from api.circuit_breaker import CIRCUIT_OPEN_MESSAGE
+from ui.idle_trimmer import IdleTrimmer
+from ui.stall_watchdog import StallWatchdog
 from ui.ui_manager_chat import ChatBarWindow
-from api.client import LocalAIClient
-
-class ChatWorker(QObject):
-    """Handles API requests in a separate thread."""
-
-    new_chunk = pyqtSignal(str)
-    stream_finished = pyqtSignal()
-    error = pyqtSignal(str)
-
-    def __init__(self):
-        super().__init__()
-        self.client = LocalAIClient()
-
-    @pyqtSlot(str)
-    def process_text(self, text):
-        """Sends text to the server and emits the response chunks."""
-        try:
-            for chunk in self.client.get_streaming_response(text):
-                self.new_chunk.emit(chunk)
-            self.stream_finished.emit()
-        except Exception as e:
-            self.error.emit(f"An unexpected error occurred: {e}")
+from workers import ChatWorker, ProcessChatWorker
 
 class ChatApp(QApplication):
     """Main application class."""
@@ -56,10 +40,17 @@ class ChatApp(QApplication):
         # Store reference to app in chat window for focus callbacks
         self.chat_window.app_reference = self
 
-        # Set up worker thread for network requests
-        self.worker_thread = QThread()
-        self.chat_worker = ChatWorker()
-        self.chat_worker.moveToThread(self.worker_thread)
+        # Set up the worker for network requests, in a thread or a separate process
+        self.worker_thread = None
+        if config.WORKER == "process":
+            self.chat_worker = ProcessChatWorker()
+            self.aboutToQuit.connect(self.chat_worker.shutdown)
+        else:
+            self.worker_thread = QThread()
+            self.chat_worker = ChatWorker()
+            self.chat_worker.moveToThread(self.worker_thread)
+            # Direct, since the worker thread may be busy streaming when the app quits.
+            self.aboutToQuit.connect(self.chat_worker.shutdown, Qt.DirectConnection)
 
         # Connect signals and slots
         self.chat_window.input_bar.returnPressed.connect(self.send_message)
@@ -70,12 +61,33 @@ class ChatApp(QApplication):
         self.chat_worker.error.connect(self.handle_error)
         self.toggle_visibility_signal.connect(self.toggle_visibility)
 
-        self.worker_thread.start()
+        if self.worker_thread is not None:
+            self.worker_thread.start()
+
+        self.watchdog = None
+        if config.WATCHDOG:
+            self.watchdog = StallWatchdog(
+                config.WATCHDOG_LOG, threshold_ms=config.WATCHDOG_THRESHOLD_MS, parent=self
+            )
+            self.watchdog.start()
+            self.aboutToQuit.connect(self.watchdog.stop)
+
+        # Release memory, timers and connections once the window has sat hidden for a while
+        self.idle_trimmer = IdleTrimmer(self.chat_window, config.IDLE_TRIM_SECONDS, parent=self)
+        self.idle_trimmer.trimmed.connect(self.chat_worker.release_idle)
+        self.idle_trimmer.rehydrated.connect(self.chat_worker.rehydrate)
+        if self.watchdog is not None:
+            self.idle_trimmer.trimmed.connect(self.watchdog.pause)
+            self.idle_trimmer.rehydrated.connect(self.watchdog.resume)
 
     def send_message(self):
         """Handles sending a message from the input bar."""
         message = self.chat_window.input_bar.text()
         if message:
+            if not self.chat_worker.backend_available():
+                # Fail fast instead of showing "Thinking..." for a server we know is down.
+                self.handle_error(CIRCUIT_OPEN_MESSAGE)
+                return
             self.chat_window.input_bar.setDisabled(True)
             self.chat_window.show_response("Thinking...")
             self.send_request.emit(message)
@@ -209,5 +221,6 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
 
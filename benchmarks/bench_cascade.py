@@ -0,0 +1,70 @@
+"""
+Exercises CascadeClient against a stub server serving two models.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_cascade
+
+The small model answers quickly but unhelpfully, the large model starts
+slowly and streams a full answer. The output shows where each prompt was
+routed, whether it was escalated, and the per-model latency/throughput
+stats the cascade collected.
+"""
+import argparse
+import time
+
+from api.raw_stream import RawStreamClient
+from api.router import ESCALATION_NOTE, CascadeClient
+from benchmarks.stub_server import StubConfig, base_url, start_stub_server
+
+PROMPTS = [
+    "hi",
+    "what's the capital of France?",
+    "!small what is 2 + 2?",
+    "explain how a B-tree keeps itself balanced",
+    "!big hello",
+    "!bigger picture, in one line?",
+    "fix this:\n```python\nprint(1\n```",
+    "x" * 500,
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--no-escalate", action="store_true")
+    args = parser.parse_args()
+
+    server = start_stub_server(StubConfig(models={
+        "small-model": {"chunks": 4, "chunk_text": "I'm not sure. ", "chunk_delay": 0.002},
+        "large-model": {"chunks": 200, "chunk_text": "detail ", "chunk_delay": 0.005,
+                        "first_token_delay": 0.3},
+    }))
+    cascade = CascadeClient(
+        RawStreamClient(base_url=base_url(server)),
+        small_model="small-model",
+        large_model="large-model",
+        escalate=not args.no_escalate,
+    )
+
+    print(f"{'prompt':<34} {'routed to':<12} {'escalated':<10} {'total ms':>9}")
+    for prompt in PROMPTS:
+        model = cascade.classify(prompt)[0]
+        start = time.perf_counter()
+        chunks = list(cascade.get_streaming_response(prompt))
+        elapsed = (time.perf_counter() - start) * 1000
+        label = prompt.replace("\n", " ")
+        label = label if len(label) <= 32 else label[:29] + "..."
+        escalated = ESCALATION_NOTE in chunks
+        print(f"{label:<34} {model:<12} {str(escalated):<10} {elapsed:>9.1f}")
+
+    print()
+    print(f"{'model':<12} {'requests':>8} {'first token ms':>15} {'stream ms':>10} {'chars/s':>10}")
+    for name, summary in cascade.stats_summary().items():
+        if not summary["requests"]:
+            continue
+        print(f"{name:<12} {summary['requests']:>8} {summary['avg_first_token_ms']:>15.1f} "
+              f"{summary['avg_stream_ms']:>10.1f} {summary['chars_per_sec']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Measures GUI event-loop lag while a fast response streams in, with the
+client running in a QThread versus in a separate process.
+
+Run from the repository root (requires PyQt5):
+
+    python -m benchmarks.bench_event_loop_lag --chunks 20000 --transport sdk
+
+A 5 ms precise timer runs on the GUI thread; lag is how late each tick
+fires. Chunks are appended to a QTextEdit as the real window does. Both
+workers coalesce chunks that arrive together, so they deliver fewer
+signals than chunks; the "thread, per chunk" row turns that off to show
+what coalescing alone is worth.
+"""
+import argparse
+import functools
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QMetaObject, Qt, QThread, QTimer, Q_ARG
+from PyQt5.QtWidgets import QApplication, QTextEdit
+
+from benchmarks.stub_server import StubConfig, start_stub_process
+from workers import ChatWorker, ProcessChatWorker
+
+TICK_MS = 5
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(app, mode, client_factory, coalesce=True):
+    """Streams one response and returns (lag samples in ms, signals, chars received, seconds)."""
+    view = QTextEdit()
+    lags = []
+    received = [0]
+    chars = [0]
+    last_tick = [time.perf_counter()]
+
+    def on_tick():
+        now = time.perf_counter()
+        lags.append(max(0.0, (now - last_tick[0]) * 1000 - TICK_MS))
+        last_tick[0] = now
+
+    def on_chunk(chunk):
+        received[0] += 1
+        chars[0] += len(chunk)
+        cursor = view.textCursor()
+        cursor.movePosition(cursor.End)
+        cursor.insertText(chunk)
+
+    ticker = QTimer()
+    ticker.setTimerType(Qt.PreciseTimer)
+    ticker.timeout.connect(on_tick)
+
+    thread = None
+    if mode == "process":
+        worker = ProcessChatWorker(client_factory)
+    else:
+        thread = QThread()
+        worker = ChatWorker(client_factory, coalesce=coalesce)
+        worker.moveToThread(thread)
+        thread.start()
+
+    worker.new_chunk.connect(on_chunk)
+    worker.stream_finished.connect(app.quit)
+    worker.error.connect(lambda message: (print(message), app.quit()))
+
+    ticker.start(TICK_MS)
+    last_tick[0] = time.perf_counter()
+    start = time.perf_counter()
+    if mode == "process":
+        worker.process_text("benchmark")
+    else:
+        QMetaObject.invokeMethod(worker, "process_text", Qt.QueuedConnection, Q_ARG(str, "benchmark"))
+    app.exec_()
+    elapsed = time.perf_counter() - start
+    ticker.stop()
+
+    if thread is not None:
+        thread.quit()
+        thread.wait()
+    else:
+        worker.shutdown()
+    return lags, received[0], chars[0], elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=20000)
+    parser.add_argument("--transport", choices=["sdk", "raw"], default="sdk")
+    args = parser.parse_args()
+
+    process, url = start_stub_process(StubConfig(chunks=args.chunks, chunk_text="token\n"))
+    if args.transport == "sdk":
+        from api.client import LocalAIClient
+        client_factory = functools.partial(LocalAIClient, base_url=url)
+    else:
+        from api.raw_stream import RawStreamClient
+        client_factory = functools.partial(RawStreamClient, base_url=url)
+
+    app = QApplication(sys.argv)
+    try:
+        print(f"{'worker':<18} {'signals':>7} {'chars':>8} {'secs':>6} "
+              f"{'lag p50':>8} {'p95':>7} {'p99':>7} {'max':>7}  (ms)")
+        for name, mode, coalesce in (("thread, per chunk", "thread", False),
+                                     ("thread", "thread", True),
+                                     ("process", "process", True)):
+            lags, signals, chars, elapsed = run(app, mode, client_factory, coalesce)
+            print(f"{name:<18} {signals:>7} {chars:>8} {elapsed:>6.2f} {percentile(lags, 0.5):>8.2f} "
+                  f"{percentile(lags, 0.95):>7.2f} {percentile(lags, 0.99):>7.2f} {max(lags):>7.2f}")
+    finally:
+        process.terminate()
+
+
+if __name__ == "__main__":
+    main()
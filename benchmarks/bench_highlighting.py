@@ -0,0 +1,127 @@
+"""
+Measures CodeHighlighter on a long multi-language answer streamed into the
+response view, against the same stream without highlighting.
+
+Run from the repository root (requires PyQt5):
+
+    python -m benchmarks.bench_highlighting --repeat 8 --token-chars 4
+
+Reports the per-chunk insert cost and how many blocks each chunk
+re-highlights, and what a whole-document rehighlight costs for comparison.
+For the final markdown render it reports the first event-loop pass (the
+render plus the first slice of colouring), the longest later pass, and the
+time until every code block is coloured, with and without a frame budget.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QTextEdit
+
+from benchmarks.bench_render import SAMPLE_ANSWER
+from ui.syntax_highlighter import CodeHighlighter
+
+
+class CountingHighlighter(CodeHighlighter):
+    """CodeHighlighter that counts highlightBlock calls."""
+    def __init__(self, document, budget_ms):
+        super().__init__(document, budget_ms)
+        self.calls = 0
+
+    def highlightBlock(self, text):
+        self.calls += 1
+        super().highlightBlock(text)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def stream(app, chunks, budget_ms):
+    """Inserts `chunks` like ChatBarWindow.append_chunk. Returns (view, highlighter, ms per chunk, blocks per chunk)."""
+    view = QTextEdit()
+    view.setUndoRedoEnabled(False)
+    highlighter = CountingHighlighter(view.document(), budget_ms) if budget_ms is not None else None
+    times, blocks = [], []
+    for chunk in chunks:
+        before = highlighter.calls if highlighter else 0
+        start = time.perf_counter()
+        cursor = view.textCursor()
+        cursor.movePosition(cursor.End)
+        cursor.insertText(chunk)
+        view.setTextCursor(cursor)
+        times.append((time.perf_counter() - start) * 1000)
+        if highlighter:
+            blocks.append(highlighter.calls - before)
+        app.processEvents()
+    return view, highlighter, times, blocks
+
+
+def render(app, view, highlighter):
+    """
+    Runs the final markdown render as ChatBarWindow.stream_finished does.
+    Returns (first pass ms, longest later pass ms, ms until colouring is complete, later passes).
+    """
+    text = view.toPlainText()
+    start = time.perf_counter()
+    if highlighter:
+        highlighter.render_markdown(view, text)
+    else:
+        view.setMarkdown(text)
+    first = (time.perf_counter() - start) * 1000
+    longest = 0.0
+    passes = 0
+    while highlighter and highlighter.rendering:
+        pass_start = time.perf_counter()
+        app.processEvents()
+        longest = max(longest, (time.perf_counter() - pass_start) * 1000)
+        passes += 1
+    return first, longest, (time.perf_counter() - start) * 1000, passes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=8, help="copies of the sample answer")
+    parser.add_argument("--token-chars", type=int, default=4, help="characters per streamed chunk")
+    parser.add_argument("--budget-ms", type=float, default=4.0, help="highlighting budget per event-loop pass")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    text = SAMPLE_ANSWER * args.repeat
+    chunks = [text[i:i + args.token_chars] for i in range(0, len(text), args.token_chars)]
+    print(f"{len(text)} chars, {text.count(chr(10)) + 1} lines, {len(chunks)} chunks")
+
+    print(f"\n{'streaming':<22} {'mean ms':>8} {'p99 ms':>8} {'max ms':>8} {'blocks/chunk':>13}")
+    runs = {}
+    for name, budget in (("plain", None), ("highlighted", args.budget_ms)):
+        view, highlighter, times, blocks = stream(app, chunks, budget)
+        runs[name] = (view, highlighter)
+        per_chunk = f"{statistics.mean(blocks):.2f}" if blocks else "-"
+        print(f"{name:<22} {statistics.mean(times):>8.3f} {percentile(times, 0.99):>8.3f} "
+              f"{max(times):>8.3f} {per_chunk:>13}")
+
+    view, highlighter = runs["highlighted"]
+    highlighter.budget = float("inf")
+    start = time.perf_counter()
+    highlighter.rehighlight()
+    whole = (time.perf_counter() - start) * 1000
+    print(f"whole-document rehighlight: {whole:.2f} ms "
+          f"(what every chunk would cost without block states)")
+
+    print(f"\n{'final render':<22} {'first ms':>9} {'later max':>10} {'done ms':>8} {'passes':>7}")
+    for name, budget in (("plain", None), (f"budget {args.budget_ms:g} ms", args.budget_ms),
+                         ("unbudgeted", float("inf"))):
+        view, highlighter, _, _ = stream(app, chunks, budget)
+        if highlighter:
+            highlighter.budget = budget / 1000
+        first, longest, done, passes = render(app, view, highlighter)
+        print(f"{name:<22} {first:>9.2f} {longest:>10.2f} {done:>8.2f} {passes:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Reports memory and wakeups while the ChatBar is active, recently hidden and
+long idle (after IdleTrimmer has released its resources).
+
+Run from the repository root (requires PyQt5):
+
+    python -m benchmarks.bench_idle --idle 5 --window 3
+
+RSS comes from psutil when installed, otherwise /proc. Wakeups/sec counts
+Qt timer events on the GUI thread and, on Linux, context switches across
+all of the process's threads. The client's circuit breaker is held open
+against a server that never answers, so its probe thread is running
+unless idle trimming has paused it.
+"""
+import argparse
+import functools
+import glob
+import os
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QMetaObject, QObject, Qt, QThread, QTimer, Q_ARG
+from PyQt5.QtWidgets import QApplication
+
+from api.recording import ReplayClient
+from benchmarks.bench_render import synthetic_recording
+from ui.idle_trimmer import IdleTrimmer
+from ui.stall_watchdog import StallWatchdog
+from ui.ui_manager_chat import ChatBarWindow
+from workers import ChatWorker
+
+
+def rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 2**20
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return float("nan")
+
+
+def context_switches():
+    total = 0
+    for path in glob.glob("/proc/self/task/*/status"):
+        try:
+            with open(path) as f:
+                for line in f:
+                    if "ctxt_switches" in line:
+                        total += int(line.split()[-1])
+        except OSError:
+            pass
+    return total
+
+
+class TimerEventCounter(QObject):
+    """Counts timer events delivered anywhere in the application."""
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Timer:
+            self.count += 1
+        return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--idle", type=float, default=5.0, help="seconds hidden before trimming")
+    parser.add_argument("--window", type=float, default=3.0, help="seconds to measure each state")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    counter = TimerEventCounter()
+    app.installEventFilter(counter)
+
+    tmp = tempfile.TemporaryDirectory()
+    recording = synthetic_recording(tmp.name, repeat=1)
+    window = ChatBarWindow()
+    watchdog = StallWatchdog(os.path.join(tmp.name, "stalls.log"))
+    watchdog.start()
+    trimmer = IdleTrimmer(window, args.idle)
+
+    thread = QThread()
+    worker = ChatWorker(functools.partial(ReplayClient, recording, speed=1.0))
+    worker.moveToThread(thread)
+    thread.start()
+    breaker = worker.client.breaker
+    breaker.probe = lambda: False
+    breaker.probe_interval = 0.05
+    for _ in range(breaker.failure_threshold):
+        breaker.record_failure()
+    worker.new_chunk.connect(window.append_chunk)
+    worker.stream_finished.connect(window.stream_finished)
+    trimmer.trimmed.connect(worker.release_idle)
+    trimmer.rehydrated.connect(worker.rehydrate)
+    trimmer.trimmed.connect(watchdog.pause)
+    trimmer.rehydrated.connect(watchdog.resume)
+
+    results = []
+    state = {"trims": 0}
+    trimmer.trimmed.connect(lambda: state.update(trims=state["trims"] + 1))
+
+    def begin(name):
+        state.update(name=name, start=time.perf_counter(), timers=counter.count, switches=context_switches())
+
+    def end():
+        elapsed = time.perf_counter() - state["start"]
+        probes = sum(1 for t in threading.enumerate() if t.name == "CircuitProbe")
+        results.append((
+            state["name"], rss_mb(),
+            (counter.count - state["timers"]) / elapsed,
+            (context_switches() - state["switches"]) / elapsed,
+            probes,
+        ))
+
+    def active_done():
+        end()
+        window.hide()
+        window.hide_response()
+        begin("recently hidden")
+        QTimer.singleShot(int(args.window * 1000), recently_hidden_done)
+
+    def recently_hidden_done():
+        end()
+        # Wait out the rest of the idle delay, then measure the trimmed state.
+        remaining = max(0.0, args.idle - args.window) + 0.5
+        QTimer.singleShot(int(remaining * 1000), lambda: begin("long idle"))
+        QTimer.singleShot(int((remaining + args.window) * 1000), long_idle_done)
+
+    def long_idle_done():
+        end()
+        start = time.perf_counter()
+        window.show()
+        window.show_response("Thinking...")
+        app.processEvents()
+        state["rehydrate_ms"] = (time.perf_counter() - start) * 1000
+        app.quit()
+
+    worker.stream_finished.connect(lambda: QTimer.singleShot(200, active_done))
+    window.show()
+    window.show_response("Thinking...")
+    begin("active")
+    QMetaObject.invokeMethod(worker, "process_text", Qt.QueuedConnection, Q_ARG(str, "replay"))
+    app.exec_()
+
+    watchdog.stop()
+    thread.quit()
+    thread.wait()
+
+    print(f"{'state':<16} {'RSS MB':>8} {'Qt timers/s':>12} {'ctx switches/s':>15} {'probe threads':>14}")
+    for name, rss, timers, switches, probes in results:
+        print(f"{name:<16} {rss:>8.1f} {timers:>12.1f} {switches:>15.1f} {probes:>14}")
+    print(f"trims: {state['trims']}, show after trim took {state['rehydrate_ms']:.1f} ms")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares the SDK streaming path (LocalAIClient) with RawStreamClient.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_raw_stream --chunks 5000 --runs 5
+
+The stub server runs in a child process, so the CPU time reported here is
+only the client's own work: per-chunk CPU cost in microseconds and
+end-to-end throughput in chunks per second. The raw client is also run
+against a server that answers with `Connection: close`, so the
+non-keep-alive path is covered.
+"""
+import argparse
+import time
+
+from benchmarks.stub_server import StubConfig, start_stub_process
+
+
+def measure(client, runs):
+    """Streams `runs` responses and returns (cpu_us_per_chunk, chunks_per_sec)."""
+    # Warm-up request so connection setup and imports are not measured.
+    for _ in client.get_streaming_response("warm up"):
+        pass
+
+    total_chunks = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(runs):
+        for chunk in client.get_streaming_response("benchmark"):
+            if chunk.startswith("Error:"):
+                raise SystemExit(f"stream failed: {chunk}")
+            total_chunks += 1
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return cpu / total_chunks * 1e6, total_chunks / wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--chunks", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    process, url = start_stub_process(StubConfig(chunks=args.chunks))
+    close_process, close_url = start_stub_process(
+        StubConfig(chunks=args.chunks, connection_close=True)
+    )
+    try:
+        clients = []
+        try:
+            from api.client import LocalAIClient
+            clients.append(("openai SDK", LocalAIClient(base_url=url)))
+        except ImportError:
+            print("openai is not installed; skipping the SDK path.")
+        from api.raw_stream import RawStreamClient
+        clients.append(("raw SSE", RawStreamClient(base_url=url)))
+        clients.append(("raw SSE, Connection: close", RawStreamClient(base_url=close_url)))
+
+        print(f"{'transport':<28} {'cpu us/chunk':>14} {'chunks/s':>12}")
+        for name, client in clients:
+            cpu_per_chunk, throughput = measure(client, args.runs)
+            print(f"{name:<28} {cpu_per_chunk:>14.1f} {throughput:>12.0f}")
+    finally:
+        process.terminate()
+        close_process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Profiles the response rendering path of ChatBarWindow against a replayed
+stream, so runs are comparable without a live model.
+
+Run from the repository root (requires PyQt5):
+
+    python -m benchmarks.bench_render --recording ~/.chatbar/recordings --speed 0
+
+Record real streams first with CHATBAR_RECORD_DIR set, or omit
+--recording to use a built-in synthetic answer. Reports call counts and
+time spent in append_chunk, adjust_height, calculate_text_height and
+stream_finished.
+"""
+import argparse
+import functools
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QMetaObject, Qt, QThread, QTimer, Q_ARG
+from PyQt5.QtWidgets import QApplication
+
+from api.recording import ReplayClient, write_recording
+from ui.ui_manager_chat import ChatBarWindow
+from workers import ChatWorker
+
+PROFILED = ("append_chunk", "adjust_height", "calculate_text_height", "stream_finished")
+
+SAMPLE_ANSWER = """Here is how you can read a file line by line in a few languages.
+
+## Python
+
+```python
+def read_lines(path):
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if line.strip():
+                yield number, line.rstrip("\\n")
+```
+
+## JavaScript
+
+```javascript
+const fs = require("fs");
+const lines = fs.readFileSync("data.txt", "utf8").split("\\n");
+for (const [i, line] of lines.entries()) {
+  console.log(`${i + 1}: ${line}`);
+}
+```
+
+## C
+
+```c
+#include <stdio.h>
+
+int main(void) {
+    char buffer[256];
+    FILE *f = fopen("data.txt", "r");
+    while (fgets(buffer, sizeof buffer, f) != NULL) {
+        printf("%s", buffer);
+    }
+    fclose(f);
+    return 0;
+}
+```
+
+Each version streams the file instead of loading it all at once, which keeps
+memory use flat for **large files**. Use `encoding` explicitly in Python to
+avoid platform-dependent defaults.
+"""
+
+
+def synthetic_recording(directory, repeat=4, token_chars=4, delay=0.01):
+    text = SAMPLE_ANSWER * repeat
+    chunks = [(delay, text[i:i + token_chars]) for i in range(0, len(text), token_chars)]
+    path = os.path.join(directory, "synthetic.cbr")
+    write_recording(path, chunks, prompt="read a file line by line")
+    return path
+
+
+def profile(window, name, timings):
+    method = getattr(window, name)
+
+    @functools.wraps(method)
+    def timed(*args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            timings[name].append(time.perf_counter() - start)
+
+    setattr(window, name, timed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--recording", help="recording file or folder (default: synthetic answer)")
+    parser.add_argument("--speed", type=float, default=0.0, help="replay speed, 0 = as fast as possible")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.recording or synthetic_recording(tmp)
+        window = ChatBarWindow()
+        timings = defaultdict(list)
+        for name in PROFILED:
+            profile(window, name, timings)
+
+        thread = QThread()
+        # Uncoalesced, so every recorded chunk reaches append_chunk at any speed.
+        worker = ChatWorker(functools.partial(ReplayClient, path, speed=args.speed), coalesce=False)
+        worker.moveToThread(thread)
+        worker.new_chunk.connect(window.append_chunk)
+        worker.stream_finished.connect(window.stream_finished)
+        # Leave time for the deferred height adjustments to run.
+        worker.stream_finished.connect(lambda: QTimer.singleShot(300, app.quit))
+        thread.start()
+
+        window.show()
+        window.show_response("Thinking...")
+        start = time.perf_counter()
+        QMetaObject.invokeMethod(worker, "process_text", Qt.QueuedConnection, Q_ARG(str, "replay"))
+        app.exec_()
+        elapsed = time.perf_counter() - start
+        thread.quit()
+        thread.wait()
+
+    print(f"replayed {path} in {elapsed:.2f}s")
+    print(f"{'function':<24} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>8}")
+    for name in PROFILED:
+        samples = timings[name]
+        if samples:
+            print(f"{name:<24} {len(samples):>6} {sum(samples) * 1000:>10.1f} "
+                  f"{sum(samples) / len(samples) * 1000:>9.3f} {max(samples) * 1000:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Measures document indexing and retrieval latency.
+
+Run from the repository root (requires numpy and openai):
+
+    python -m benchmarks.bench_retrieval --docs 200 --queries 50
+
+Embeddings come from the stub server's hashed bag-of-words /embeddings
+endpoint. Reports a full index, an incremental re-index after touching one
+file, the size of the metadata rewritten on each change, per-query embed/search latency, and raw vectorized search time on a
+large synthetic store.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.stub_server import base_url, start_stub_server
+from retrieval.embedder import Embedder
+from retrieval.retriever import Indexer, Retriever
+from retrieval.store import VectorStore
+
+WORDS = ("cache latency thread socket render buffer token model index vector query "
+         "window hotkey stream chunk memory layout signal timer parser server").split()
+
+
+def write_docs(directory, count, rng):
+    for i in range(count):
+        paragraphs = [" ".join(rng.choice(WORDS) for _ in range(80)) for _ in range(6)]
+        with open(os.path.join(directory, f"doc{i:04}.md"), "w") as f:
+            f.write("\n\n".join(paragraphs))
+
+
+def timed_refresh(indexer):
+    start = time.perf_counter()
+    indexer.refresh().result()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--synthetic-rows", type=int, default=100000)
+    parser.add_argument("--synthetic-dim", type=int, default=768)
+    args = parser.parse_args()
+    rng = random.Random(0)
+
+    server = start_stub_server()
+    embedder = Embedder(base_url=base_url(server))
+    with tempfile.TemporaryDirectory() as docs, tempfile.TemporaryDirectory() as index_dir:
+        write_docs(docs, args.docs, rng)
+        store = VectorStore(index_dir)
+        indexer = Indexer(store, embedder, [docs], max_workers=4)
+
+        full = timed_refresh(indexer)
+        rows = int(store.valid.sum())
+        print(f"full index:        {args.docs} files, {rows} chunks in {full:.2f}s")
+
+        unchanged = timed_refresh(indexer)
+        print(f"unchanged rescan:  {unchanged * 1000:.1f} ms")
+
+        with open(os.path.join(docs, "doc0000.md"), "a") as f:
+            f.write("\n\nnew paragraph about hotkey latency")
+        incremental = timed_refresh(indexer)
+        print(f"one file changed:  {incremental * 1000:.1f} ms")
+        meta_kb = os.path.getsize(store.meta_path) / 1024
+        texts_kb = os.path.getsize(store.texts_path) / 1024
+        print(f"on disk:           index.json {meta_kb:.1f} KB, chunk texts {texts_kb:.1f} KB")
+
+        retriever = Retriever(store, embedder, top_k=5)
+        for _ in range(args.queries):
+            retriever.retrieve(" ".join(rng.choice(WORDS) for _ in range(8)))
+        summary = retriever.latency_summary()
+        print(f"query latency:     embed {summary['avg_embed_ms']:.2f} ms, "
+              f"search {summary['avg_search_ms']:.3f} ms, worst total {summary['max_total_ms']:.2f} ms")
+        indexer.shutdown()
+
+    with tempfile.TemporaryDirectory() as index_dir:
+        store = VectorStore(index_dir)
+        vectors = np.random.default_rng(0).standard_normal(
+            (args.synthetic_rows, args.synthetic_dim), dtype=np.float32
+        )
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        store.replace_file("synthetic", 0, 0, "", ["x"] * args.synthetic_rows, vectors)
+        query = vectors[0]
+        start = time.perf_counter()
+        for _ in range(20):
+            store.search(query, 5)
+        elapsed = (time.perf_counter() - start) / 20
+        print(f"synthetic search:  {args.synthetic_rows} x {args.synthetic_dim} in {elapsed * 1000:.2f} ms")
+        store.vectors = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Measures how long the clients take to surface an error for a broken backend.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_timeouts
+
+Scenarios: nothing listening on the port (down), a server that never starts
+answering (slow), a server that stops mid-stream (stalled), and a request
+made after the circuit breaker has opened (circuit open). The SDK applies
+one read timeout to every read, so its stalled case waits for the larger
+of the first-token and chunk timeouts; only the raw client times the gap
+between chunks separately.
+"""
+import argparse
+import socket
+import time
+
+from benchmarks.stub_server import StubConfig, base_url, start_stub_server
+
+
+def unused_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_error(client):
+    """Returns (seconds until the error chunk arrived, error text)."""
+    start = time.perf_counter()
+    for chunk in client.get_streaming_response("hello"):
+        if chunk.startswith("Error:"):
+            return time.perf_counter() - start, chunk
+    return time.perf_counter() - start, "(no error)"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--connect-timeout", type=float, default=2.0)
+    parser.add_argument("--first-token-timeout", type=float, default=3.0)
+    parser.add_argument("--chunk-timeout", type=float, default=1.0)
+    args = parser.parse_args()
+    timeouts = dict(
+        connect_timeout=args.connect_timeout,
+        first_token_timeout=args.first_token_timeout,
+        chunk_timeout=args.chunk_timeout,
+    )
+
+    factories = []
+    try:
+        from api.client import LocalAIClient
+        factories.append(("openai SDK", LocalAIClient))
+    except ImportError:
+        print("openai is not installed; skipping the SDK path.")
+    from api.raw_stream import RawStreamClient
+    factories.append(("raw SSE", RawStreamClient))
+
+    slow = start_stub_server(StubConfig(chunks=10, first_token_delay=3600))
+    stalled = start_stub_server(StubConfig(chunks=10, stall_after=5))
+    scenarios = [
+        ("down", f"http://127.0.0.1:{unused_port()}/v1"),
+        ("slow", base_url(slow)),
+        ("stalled", base_url(stalled)),
+    ]
+
+    print(f"{'transport':<12} {'scenario':<14} {'time to error':>14}  message")
+    for name, factory in factories:
+        for scenario, url in scenarios:
+            client = factory(base_url=url, **timeouts)
+            elapsed, message = time_to_error(client)
+            print(f"{name:<12} {scenario:<14} {elapsed:>13.3f}s  {message}")
+
+        client = factory(base_url=scenarios[0][1], **timeouts)
+        while not client.breaker.is_open:
+            time_to_error(client)
+        elapsed, message = time_to_error(client)
+        print(f"{name:<12} {'circuit open':<14} {elapsed:>13.3f}s  {message}")
+        client.breaker.close()
+
+
+if __name__ == "__main__":
+    main()
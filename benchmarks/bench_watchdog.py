@@ -0,0 +1,106 @@
+"""
+Checks that StallWatchdog catches and samples stalls of the GUI thread,
+including ones spent inside a Qt call that holds the GIL.
+
+Run from the repository root (requires PyQt5):
+
+    python -m benchmarks.bench_watchdog
+
+Three stalls are provoked in turn: a pure-Python busy loop, and two long
+Qt calls that hold the GIL throughout (laying out a large plain-text
+document and a large QTextEdit.setMarkdown). For each, the output compares
+the stall's real duration with the logged STALL record, and shows how
+many stack samples were taken and whether they point at the stalling
+function. A sampler that needs the GIL gets at most one late sample of
+the Qt stalls.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QTextDocument
+from PyQt5.QtWidgets import QApplication, QTextEdit
+
+from benchmarks.bench_render import SAMPLE_ANSWER
+from ui.stall_watchdog import StallWatchdog
+
+
+def busy_python(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def lay_out_long_text(repeat):
+    document = QTextDocument()
+    document.setTextWidth(400)
+    document.setPlainText(SAMPLE_ANSWER * repeat)
+    document.size()
+
+
+def render_large_markdown(repeat):
+    view = QTextEdit()
+    view.setMarkdown(SAMPLE_ANSWER * repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0, help="length of the busy-loop stall")
+    parser.add_argument("--layout-repeat", type=int, default=3000, help="copies of the sample answer to lay out")
+    parser.add_argument("--markdown-repeat", type=int, default=2000, help="copies of the sample answer to render")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    tmp = tempfile.TemporaryDirectory()
+    log_path = os.path.join(tmp.name, "stalls.log")
+    watchdog = StallWatchdog(log_path)
+    watchdog.start()
+
+    scenarios = [
+        ("busy_python", lambda: busy_python(args.seconds)),
+        ("lay_out_long_text", lambda: lay_out_long_text(args.layout_repeat)),
+        ("render_large_markdown", lambda: render_large_markdown(args.markdown_repeat)),
+    ]
+    durations = []
+
+    def run_next():
+        if len(durations) == len(scenarios):
+            app.quit()
+            return
+        name, stall = scenarios[len(durations)]
+        start = time.perf_counter()
+        stall()
+        durations.append((name, time.perf_counter() - start))
+        # Let a few heartbeats through so each stall is logged on its own.
+        QTimer.singleShot(500, run_next)
+
+    QTimer.singleShot(500, run_next)
+    app.exec_()
+    watchdog.stop()
+
+    with open(log_path, encoding="utf-8") as f:
+        records = [r for r in re.split(r"^(?=\S+ \S+ (?:STALL|SUMMARY))", f.read(), flags=re.M)
+                   if " STALL " in r]
+
+    print(f"{'stall':<24} {'real ms':>8} {'logged ms':>10} {'samples':>8}  stack names it")
+    for name, duration in durations:
+        # Stalls are provoked one at a time, so records are in the same order.
+        if not records:
+            print(f"{name:<24} {duration * 1000:>8.0f} {'missed':>10}")
+            continue
+        logged = records.pop(0)
+        header = re.search(r"STALL (\d+) ms .*?, (\d+) stack samples", logged)
+        print(f"{name:<24} {duration * 1000:>8.0f} {header.group(1):>10} {header.group(2):>8}  "
+              f"{'yes' if name in logged else 'no'}")
+    print(f"unmatched STALL records: {len(records)}")
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+A stand-in for an OpenAI-compatible local server, used by the benchmarks.
+
+It streams a fixed number of chat completion chunks as server-sent events
+so the client side can be measured without a real model.
+"""
+import hashlib
+import json
+import math
+import multiprocessing
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubConfig:
+    """
+    Controls the shape of the stream the stub server produces.
+
+    `first_token_delay` holds back the first chunk (a slow server) and
+    `stall_after` stops sending, without closing, after that many chunks
+    (a server wedged mid-stream). `connection_close` answers with
+    `Connection: close` and an unframed body ended by closing the socket,
+    like servers that do not keep connections alive.
+
+    `models` maps model names to dicts of overrides for these settings, so
+    one server can stand in for several models of different speeds. When it
+    is set, requests for any other model get a 404 like a real server.
+    """
+    def __init__(self, chunks=2000, chunk_text="token ", chunk_delay=0.0,
+                 first_token_delay=0.0, stall_after=None, stall_seconds=3600.0,
+                 connection_close=False, models=None):
+        self.chunks = chunks
+        self.chunk_text = chunk_text
+        self.chunk_delay = chunk_delay
+        self.first_token_delay = first_token_delay
+        self.stall_after = stall_after
+        self.stall_seconds = stall_seconds
+        self.connection_close = connection_close
+        self.models = models or {}
+
+    def model_names(self):
+        return list(self.models) or ["llama-3.2-1b-instruct"]
+
+    def for_model(self, model):
+        """Returns the settings for `model`, or None if the server does not serve it."""
+        if not self.models:
+            return self
+        if model not in self.models:
+            return None
+        settings = dict(vars(self), models=None)
+        settings.update(self.models[model])
+        return StubConfig(**settings)
+
+
+EMBEDDING_DIM = 256
+
+
+def hashed_embedding(text):
+    """A deterministic bag-of-words embedding, so similar texts score as similar."""
+    vector = [0.0] * EMBEDDING_DIM
+    for word in text.lower().split():
+        digest = hashlib.md5(word.strip(".,:;!?()[]\"'").encode()).digest()
+        vector[int.from_bytes(digest[:4], "little") % EMBEDDING_DIM] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _write_chunk(self, data):
+        if self.close_connection:
+            if data:
+                self.wfile.write(data)
+        else:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            body = json.dumps({"object": "list", "data": [
+                {"id": name, "object": "model"} for name in self.server.config.model_names()
+            ]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def _embeddings(self, request):
+        texts = request.get("input", [])
+        if isinstance(texts, str):
+            texts = [texts]
+        body = json.dumps({"object": "list", "model": request.get("model"), "data": [
+            {"object": "embedding", "index": i, "embedding": hashed_embedding(text)}
+            for i, text in enumerate(texts)
+        ]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path.rstrip("/").endswith("/embeddings"):
+            self._embeddings(request)
+            return
+        model = request.get("model", "stub")
+        config = self.server.config.for_model(model)
+        if config is None:
+            self.send_error(404, f"Model {model} not found")
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        if config.connection_close:
+            self.send_header("Connection", "close")
+        else:
+            self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        self.wfile.flush()
+
+        created = int(time.time())
+        if config.first_token_delay:
+            time.sleep(config.first_token_delay)
+        for i in range(config.chunks):
+            if i == config.stall_after:
+                self.wfile.flush()
+                time.sleep(config.stall_seconds)
+            if config.chunk_delay:
+                time.sleep(config.chunk_delay)
+            event = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "system_fingerprint": None,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"role": "assistant", "content": config.chunk_text},
+                    "logprobs": None,
+                    "finish_reason": None,
+                }],
+            }
+            self._write_chunk(b"data: " + json.dumps(event).encode() + b"\n\n")
+        self._write_chunk(b"data: [DONE]\n\n")
+        self._write_chunk(b"")
+        self.wfile.flush()
+
+
+def start_stub_server(config=None, host="127.0.0.1", port=0):
+    """Starts the stub server on a background thread and returns it."""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.config = config or StubConfig()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+def base_url(server):
+    """Returns the `/v1` base URL clients should use for a running stub server."""
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/v1"
+
+
+def serve_forever_in_process(config, port_queue):
+    """multiprocessing target: runs the stub server until the process is killed."""
+    server = start_stub_server(config)
+    port_queue.put(server.server_address[1])
+    threading.Event().wait()
+
+
+def start_stub_process(config=None):
+    """
+    Runs the stub server in a child process so its CPU time does not count
+    against the client being measured. Returns (process, base_url).
+    """
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=serve_forever_in_process, args=(config or StubConfig(), port_queue), daemon=True
+    )
+    process.start()
+    port = port_queue.get(timeout=10)
+    return process, f"http://127.0.0.1:{port}/v1"
@@ -0,0 +1,63 @@
+"""
+Runtime settings for ChatBar.
+
+Each value can be overridden with an environment variable so the app can be
+tuned without editing the code.
+"""
+import os
+
+BASE_URL = os.environ.get("CHATBAR_BASE_URL", "http://127.0.0.1:1234/v1")
+
+# "sdk" streams through the openai package, "raw" through api.raw_stream.
+TRANSPORT = os.environ.get("CHATBAR_TRANSPORT", "sdk")
+
+# Seconds to wait for the connection, for the first token and between chunks.
+# The gap between chunks is only bounded separately with the "raw" transport;
+# "sdk" uses max(FIRST_TOKEN_TIMEOUT, CHUNK_TIMEOUT) for every read.
+CONNECT_TIMEOUT = float(os.environ.get("CHATBAR_CONNECT_TIMEOUT", "2"))
+FIRST_TOKEN_TIMEOUT = float(os.environ.get("CHATBAR_FIRST_TOKEN_TIMEOUT", "30"))
+CHUNK_TIMEOUT = float(os.environ.get("CHATBAR_CHUNK_TIMEOUT", "10"))
+
+# Consecutive failures before requests are refused, and seconds between probes.
+BREAKER_THRESHOLD = int(os.environ.get("CHATBAR_BREAKER_THRESHOLD", "3"))
+BREAKER_PROBE_INTERVAL = float(os.environ.get("CHATBAR_BREAKER_PROBE_INTERVAL", "5"))
+
+# Model cascade: set both names to route quick prompts to the small model and
+# harder ones to the large model. ESCALATE retries weak small-model answers.
+SMALL_MODEL = os.environ.get("CHATBAR_SMALL_MODEL", "")
+LARGE_MODEL = os.environ.get("CHATBAR_LARGE_MODEL", "")
+ESCALATE = os.environ.get("CHATBAR_ESCALATE", "0") == "1"
+
+# "thread" runs the client in a QThread, "process" in a separate process that
+# hands chunks to the GUI through shared memory.
+WORKER = os.environ.get("CHATBAR_WORKER", "thread")
+
+# Event-loop stall watchdog: logs GUI stalls longer than the threshold with
+# sampled stacks, plus periodic lag percentiles, to a bounded rotating log.
+WATCHDOG = os.environ.get("CHATBAR_WATCHDOG", "1") == "1"
+WATCHDOG_THRESHOLD_MS = int(os.environ.get("CHATBAR_WATCHDOG_THRESHOLD_MS", "200"))
+WATCHDOG_LOG = os.environ.get(
+    "CHATBAR_WATCHDOG_LOG", os.path.join(os.path.expanduser("~"), ".chatbar", "stalls.log")
+)
+
+# Document retrieval: folders to index, separated by os.pathsep. Empty disables it.
+RETRIEVAL_DIRS = [d for d in os.environ.get("CHATBAR_RETRIEVAL_DIRS", "").split(os.pathsep) if d]
+RETRIEVAL_INDEX = os.environ.get(
+    "CHATBAR_RETRIEVAL_INDEX", os.path.join(os.path.expanduser("~"), ".chatbar", "index")
+)
+EMBEDDING_MODEL = os.environ.get("CHATBAR_EMBEDDING_MODEL", "text-embedding-nomic-embed-text-v1.5")
+RETRIEVAL_TOP_K = int(os.environ.get("CHATBAR_RETRIEVAL_TOP_K", "5"))
+RETRIEVAL_TOKEN_BUDGET = int(os.environ.get("CHATBAR_RETRIEVAL_TOKEN_BUDGET", "1500"))
+# Seconds to wait for the prompt's embedding before answering without documents
+RETRIEVAL_TIMEOUT = float(os.environ.get("CHATBAR_RETRIEVAL_TIMEOUT", "3"))
+
+# Stream recording and replay: RECORD_DIR saves every response with its timing;
+# REPLAY (a recording or folder of them) plays them back instead of calling the
+# server, at REPLAY_SPEED times the original pace (0 = as fast as possible).
+RECORD_DIR = os.environ.get("CHATBAR_RECORD_DIR", "")
+REPLAY = os.environ.get("CHATBAR_REPLAY", "")
+REPLAY_SPEED = float(os.environ.get("CHATBAR_REPLAY_SPEED", "1"))
+
+# Seconds the window may stay hidden before its memory, timers and idle
+# connections are released.
+IDLE_TRIM_SECONDS = float(os.environ.get("CHATBAR_IDLE_TRIM_SECONDS", "120"))
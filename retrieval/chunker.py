@@ -0,0 +1,41 @@
+import os
+
+DEFAULT_EXTENSIONS = (".md", ".txt", ".rst", ".py", ".json", ".yaml", ".yml", ".toml", ".ini")
+
+
+def iter_files(directories, extensions=DEFAULT_EXTENSIONS):
+    """Yields the absolute paths of indexable files under `directories`."""
+    for directory in directories:
+        for root, dirs, files in os.walk(os.path.expanduser(directory)):
+            # Skip hidden folders such as .git.
+            dirs[:] = [d for d in dirs if not d.startswith(".")]
+            for name in files:
+                if name.lower().endswith(extensions):
+                    yield os.path.abspath(os.path.join(root, name))
+
+
+def chunk_text(text, max_chars=1200, overlap=200):
+    """
+    Splits text into chunks of at most `max_chars`, preferring paragraph
+    boundaries. Paragraphs longer than a chunk are cut with `overlap`
+    characters carried over so sentences are not lost at the seams.
+    """
+    chunks = []
+    current = ""
+    for paragraph in text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(current) + len(paragraph) + 2 <= max_chars:
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+            continue
+        if current:
+            chunks.append(current)
+            current = ""
+        while len(paragraph) > max_chars:
+            chunks.append(paragraph[:max_chars])
+            paragraph = paragraph[max_chars - overlap:]
+        current = paragraph
+    if current:
+        chunks.append(current)
+    return chunks
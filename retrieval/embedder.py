@@ -0,0 +1,50 @@
+import httpx
+import numpy as np
+from openai import OpenAI, APIConnectionError
+
+
+class EmbeddingUnavailable(Exception):
+    """The server could not be reached or did not answer in time."""
+
+
+class Embedder:
+    """
+    Embeds text with the local server's OpenAI-compatible /embeddings
+    endpoint and returns unit-length float32 vectors.
+
+    `connect_timeout` bounds opening the connection and `timeout` each read.
+    Transport failures raise EmbeddingUnavailable.
+    """
+    def __init__(self, base_url="http://127.0.0.1:1234/v1",
+                 model="text-embedding-nomic-embed-text-v1.5", batch_size=32,
+                 connect_timeout=2.0, timeout=30.0):
+        self.client_options = dict(
+            base_url=base_url,
+            api_key="not-needed",
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            max_retries=0,
+        )
+        self.client = OpenAI(**self.client_options)
+        self.model = model
+        self.batch_size = batch_size
+
+    def release_idle(self):
+        """Closes pooled connections; a new pool connects lazily on the next request."""
+        self.client.close()
+        self.client = OpenAI(**self.client_options)
+
+    def embed(self, texts):
+        """Returns an array of shape (len(texts), dim)."""
+        rows = []
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            try:
+                response = self.client.embeddings.create(model=self.model, input=batch)
+            except (APIConnectionError, httpx.TransportError) as e:
+                # APITimeoutError is an APIConnectionError.
+                raise EmbeddingUnavailable(str(e)) from e
+            rows.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+        vectors = np.asarray(rows, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
@@ -0,0 +1,197 @@
+import hashlib
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from retrieval.chunker import DEFAULT_EXTENSIONS, chunk_text, iter_files
+
+
+def estimate_tokens(text):
+    """Rough token count; about four characters per token for English text."""
+    return len(text) // 4 + 1
+
+
+class Indexer:
+    """
+    Keeps a VectorStore in sync with a set of directories.
+
+    `refresh()` returns immediately: a scan thread compares each file's
+    mtime and size with the store, hashes only files that look changed, and
+    hands files whose content really changed to a pool that chunks and
+    embeds them. Deleted files are dropped from the store. `shutdown()`
+    stops a running scan between files and drops the queued ones.
+    """
+    def __init__(self, store, embedder, directories, extensions=DEFAULT_EXTENSIONS,
+                 max_workers=2, chunk_chars=1200, chunk_overlap=200):
+        self.store = store
+        self.embedder = embedder
+        self.directories = directories
+        self.extensions = extensions
+        self.chunk_chars = chunk_chars
+        self.chunk_overlap = chunk_overlap
+        self.scan_pool = ThreadPoolExecutor(1, thread_name_prefix="IndexScan")
+        self.embed_pool = ThreadPoolExecutor(max_workers, thread_name_prefix="IndexEmbed")
+        self.last_scan = 0.0
+        self._scan_future = None
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+
+    def refresh(self):
+        """Starts a background scan unless one is already running."""
+        with self._lock:
+            if self._stopped.is_set():
+                return None
+            if self._scan_future is not None and not self._scan_future.done():
+                return self._scan_future
+            self.last_scan = time.monotonic()
+            self._scan_future = self.scan_pool.submit(self._scan)
+            return self._scan_future
+
+    def _scan(self):
+        start = time.perf_counter()
+        seen = set()
+        futures = []
+        for path in iter_files(self.directories, self.extensions):
+            if self._stopped.is_set():
+                break
+            seen.add(path)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            info = self.store.file_info(path)
+            if info and info["mtime"] == stat.st_mtime and info["size"] == stat.st_size:
+                continue
+            futures.append(self.embed_pool.submit(self._index_file, path, stat, info))
+
+        if not self._stopped.is_set():
+            # Only a complete walk tells which files were deleted.
+            with self.store.lock:
+                known = list(self.store.files)
+            for path in known:
+                if path not in seen:
+                    self.store.remove_file(path)
+
+        wait(futures)
+        changed = sum(1 for future in futures if future.exception() is None and future.result())
+        for future in futures:
+            if future.exception() is not None:
+                print(f"Failed to index a document: {future.exception()}")
+        self.store.save()
+        if changed:
+            print(f"Indexed {changed} changed documents in {time.perf_counter() - start:.1f}s")
+
+    def _index_file(self, path, stat, info):
+        """Re-embeds `path` if its content changed. Returns True if it did."""
+        if self._stopped.is_set():
+            return False
+        with open(path, "rb") as f:
+            data = f.read()
+        digest = hashlib.sha1(data).hexdigest()
+        if info and info["sha1"] == digest:
+            self.store.touch(path, stat.st_mtime, stat.st_size)
+            return False
+
+        chunks = chunk_text(data.decode("utf-8", errors="replace"), self.chunk_chars, self.chunk_overlap)
+        if not chunks:
+            self.store.remove_file(path)
+            return False
+        vectors = self.embedder.embed(chunks)
+        self.store.replace_file(path, stat.st_mtime, stat.st_size, digest, chunks, vectors)
+        return True
+
+    def release_idle(self):
+        """Closes the embedder's pooled connections unless a scan is using them."""
+        with self._lock:
+            if self._scan_future is not None and not self._scan_future.done():
+                return
+            self.embedder.release_idle()
+
+    def shutdown(self):
+        """Stops indexing without waiting; files already embedded are still saved."""
+        self._stopped.set()
+        self.scan_pool.shutdown(wait=False, cancel_futures=True)
+        # Queued files return at once once stopped. Cancelling them instead would
+        # leave the scan's wait() blocked: wait() never sees those futures finish.
+        self.embed_pool.shutdown(wait=False)
+
+
+class Retriever:
+    """
+    Finds the stored chunks most similar to a prompt and returns as many of
+    them as fit in `token_budget`. Query latency is kept for reporting.
+
+    With a `breaker`, retrieval is skipped while the chat circuit is open.
+    A slow or unreachable embedding endpoint only skips the documents for
+    that prompt; it is not a chat failure and does not trip the breaker.
+    """
+    def __init__(self, store, embedder, indexer=None, top_k=5, token_budget=1500,
+                 min_score=0.2, rescan_interval=60.0, breaker=None):
+        self.store = store
+        self.embedder = embedder
+        self.indexer = indexer
+        self.top_k = top_k
+        self.token_budget = token_budget
+        self.min_score = min_score
+        self.rescan_interval = rescan_interval
+        self.breaker = breaker
+        self.latencies = deque(maxlen=256)
+
+    def retrieve(self, prompt):
+        """Returns a list of {"file", "text"} dicts, best match first."""
+        if self.breaker and not self.breaker.allow_request():
+            return []
+        if self.indexer and time.monotonic() - self.indexer.last_scan > self.rescan_interval:
+            self.indexer.refresh()
+        if not self.store.count():
+            # Nothing indexed yet; don't make the prompt wait for its embedding.
+            return []
+
+        start = time.perf_counter()
+        try:
+            query = self.embedder.embed([prompt])[0]
+            embedded = time.perf_counter()
+            results = self.store.search(query, self.top_k)
+        except Exception as e:
+            # Answer without documents rather than failing the whole request.
+            print(f"Document retrieval failed: {e}")
+            return []
+        searched = time.perf_counter()
+        self.latencies.append((embedded - start, searched - embedded))
+
+        context = []
+        used = 0
+        for score, chunk in results:
+            if score < self.min_score:
+                break
+            tokens = estimate_tokens(chunk["text"])
+            if used + tokens > self.token_budget:
+                continue
+            context.append(chunk)
+            used += tokens
+        return context
+
+    def release_idle(self):
+        if self.indexer is None or self.indexer.embedder is not self.embedder:
+            self.embedder.release_idle()
+        if self.indexer:
+            self.indexer.release_idle()
+
+    def shutdown(self):
+        if self.indexer:
+            self.indexer.shutdown()
+
+    def latency_summary(self):
+        """Returns average and worst embed/search times in milliseconds."""
+        if not self.latencies:
+            return {}
+        embeds = [e for e, _ in self.latencies]
+        searches = [s for _, s in self.latencies]
+        return {
+            "queries": len(self.latencies),
+            "avg_embed_ms": sum(embeds) / len(embeds) * 1000,
+            "avg_search_ms": sum(searches) / len(searches) * 1000,
+            "max_total_ms": max(e + s for e, s in self.latencies) * 1000,
+        }
@@ -0,0 +1,204 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+FORMAT_VERSION = 2
+
+
+class VectorStore:
+    """
+    A memory-mapped store of unit-length embedding vectors.
+
+    Vectors live in `vectors.f32`, a raw float32 file mapped with np.memmap,
+    so the index is paged in by the OS instead of loaded into the heap.
+    Chunk texts are appended to `chunks.txt` and each row's (offset, length)
+    in it is kept in the mapped `spans.i64`; texts are only read back for
+    search results. `index.json` records just, per file, its mtime/size/hash
+    and the rows it owns. Rows freed by a changed or deleted file are reused
+    before the maps grow, and `chunks.txt` is compacted once most of it is
+    dead text.
+    """
+    def __init__(self, directory):
+        self.directory = os.path.expanduser(directory)
+        os.makedirs(self.directory, exist_ok=True)
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.spans_path = os.path.join(self.directory, "spans.i64")
+        self.texts_path = os.path.join(self.directory, "chunks.txt")
+        self.meta_path = os.path.join(self.directory, "index.json")
+        self.lock = threading.RLock()
+
+        self.dim = None
+        self.capacity = 0
+        self.files = {}
+        self.row_files = []
+        self.vectors = None
+        self.spans = None
+        self.valid = np.zeros(0, dtype=bool)
+        self.dead_bytes = 0
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.meta_path):
+            return
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Retrieval index is unreadable, rebuilding: {e}")
+            return
+        if meta.get("version") != FORMAT_VERSION:
+            print("Retrieval index is in an older format, rebuilding.")
+            return
+        self.dim = meta["dim"]
+        self.capacity = meta["capacity"]
+        self.files = meta["files"]
+        self.dead_bytes = meta["dead_bytes"]
+        if self.dim and self.capacity:
+            self.vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r+", shape=(self.capacity, self.dim)
+            )
+            self.spans = np.memmap(self.spans_path, dtype=np.int64, mode="r+", shape=(self.capacity, 2))
+        self.valid = np.zeros(self.capacity, dtype=bool)
+        self.row_files = [None] * self.capacity
+        for path, info in self.files.items():
+            self.valid[info["rows"]] = True
+            for row in info["rows"]:
+                self.row_files[row] = path
+
+    def save(self):
+        """Flushes the maps, compacts the chunk texts if needed and atomically rewrites the metadata."""
+        with self.lock:
+            if not self.dirty:
+                return
+            if self.spans is not None and self.dead_bytes > self._live_bytes():
+                self._compact_texts()
+            if self.vectors is not None:
+                self.vectors.flush()
+                self.spans.flush()
+            meta = {
+                "version": FORMAT_VERSION, "dim": self.dim, "capacity": self.capacity,
+                "dead_bytes": self.dead_bytes, "files": self.files,
+            }
+            tmp_path = self.meta_path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            os.replace(tmp_path, self.meta_path)
+            self.dirty = False
+
+    def _live_bytes(self):
+        return int(self.spans[self.valid, 1].sum())
+
+    def _compact_texts(self):
+        """Rewrites chunks.txt with only the texts of live rows."""
+        rows = np.flatnonzero(self.valid)
+        tmp_path = self.texts_path + ".tmp"
+        offset = 0
+        with open(self.texts_path, "rb") as src, open(tmp_path, "wb") as dst:
+            for row in rows[np.argsort(self.spans[rows, 0])]:
+                start, length = self.spans[row]
+                src.seek(start)
+                dst.write(src.read(length))
+                self.spans[row] = (offset, length)
+                offset += length
+        os.replace(tmp_path, self.texts_path)
+        self.dead_bytes = 0
+
+    def _grow(self, needed):
+        """Makes room for `needed` more rows, doubling the mapped files as required."""
+        free = int(self.capacity - self.valid.sum())
+        if free >= needed:
+            return
+        new_capacity = max(64, self.capacity * 2)
+        while new_capacity - self.capacity + free < needed:
+            new_capacity *= 2
+
+        if self.vectors is not None:
+            self.vectors.flush()
+            self.spans.flush()
+            self.vectors = None
+            self.spans = None
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(new_capacity * self.dim * 4)
+        with open(self.spans_path, "ab") as f:
+            f.truncate(new_capacity * 2 * 8)
+        self.vectors = np.memmap(
+            self.vectors_path, dtype=np.float32, mode="r+", shape=(new_capacity, self.dim)
+        )
+        self.spans = np.memmap(self.spans_path, dtype=np.int64, mode="r+", shape=(new_capacity, 2))
+        self.valid = np.concatenate([self.valid, np.zeros(new_capacity - self.capacity, dtype=bool)])
+        self.row_files.extend([None] * (new_capacity - self.capacity))
+        self.capacity = new_capacity
+
+    def count(self):
+        """Returns the number of stored chunks."""
+        with self.lock:
+            return int(self.valid.sum())
+
+    def file_info(self, path):
+        with self.lock:
+            return self.files.get(path)
+
+    def touch(self, path, mtime, size):
+        """Records a new mtime/size for a file whose content did not change."""
+        with self.lock:
+            self.files[path]["mtime"] = mtime
+            self.files[path]["size"] = size
+            self.dirty = True
+
+    def remove_file(self, path):
+        with self.lock:
+            info = self.files.pop(path, None)
+            if info is None:
+                return
+            for row in info["rows"]:
+                self.valid[row] = False
+                self.row_files[row] = None
+                self.dead_bytes += int(self.spans[row, 1])
+            self.dirty = True
+
+    def replace_file(self, path, mtime, size, digest, chunks, vectors):
+        """Stores the chunks and unit vectors of `path`, replacing its old rows."""
+        with self.lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"embedding size changed from {self.dim} to {vectors.shape[1]}")
+            self.remove_file(path)
+            self._grow(len(chunks))
+
+            rows = np.flatnonzero(~self.valid)[:len(chunks)]
+            self.vectors[rows] = vectors
+            self.valid[rows] = True
+            with open(self.texts_path, "ab") as f:
+                offset = f.tell()
+                for row, chunk in zip(rows, chunks):
+                    data = chunk.encode("utf-8")
+                    f.write(data)
+                    self.spans[row] = (offset, len(data))
+                    self.row_files[row] = path
+                    offset += len(data)
+            self.files[path] = {"mtime": mtime, "size": size, "sha1": digest, "rows": rows.tolist()}
+            self.dirty = True
+
+    def search(self, query, k):
+        """Returns up to `k` (score, chunk) pairs by cosine similarity to the unit vector `query`."""
+        with self.lock:
+            if self.vectors is None or not self.valid.any():
+                return []
+            scores = self.vectors @ query
+            scores[~self.valid] = -np.inf
+            k = min(k, int(self.valid.sum()))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            results = []
+            with open(self.texts_path, "rb") as f:
+                for row in top:
+                    start, length = self.spans[row]
+                    f.seek(start)
+                    text = f.read(length).decode("utf-8")
+                    results.append((float(scores[row]), {"file": self.row_files[row], "text": text}))
+            return results
@@ -0,0 +1,57 @@
+import ctypes
+import gc
+import sys
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+
+def release_process_memory():
+    """Asks the OS allocator to hand freed memory back after a collection."""
+    try:
+        if sys.platform == "win32":
+            handle = ctypes.windll.kernel32.GetCurrentProcess()
+            ctypes.windll.kernel32.SetProcessWorkingSetSize(handle, ctypes.c_size_t(-1), ctypes.c_size_t(-1))
+        elif sys.platform.startswith("linux"):
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except Exception as e:
+        print(f"Failed to release process memory: {e}")
+
+
+class IdleTrimmer(QObject):
+    """
+    Releases resources once the chat window has been hidden for `idle_seconds`.
+
+    On trim the window drops its document and animation state, `trimmed` is
+    emitted so the owner can stop timers and close pooled connections, and
+    garbage is collected. The next time the window is shown `rehydrated` is
+    emitted; everything else is rebuilt lazily on first use.
+    """
+
+    trimmed = pyqtSignal()
+    rehydrated = pyqtSignal()
+
+    def __init__(self, window, idle_seconds=120, parent=None):
+        super().__init__(parent)
+        self.window = window
+        self.is_trimmed = False
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(int(idle_seconds * 1000))
+        self.timer.timeout.connect(self.trim)
+        window.hidden.connect(self.timer.start)
+        window.shown.connect(self.on_shown)
+
+    def trim(self):
+        if self.is_trimmed or self.window.isVisible():
+            return
+        self.window.release_resources()
+        self.trimmed.emit()
+        gc.collect()
+        release_process_memory()
+        self.is_trimmed = True
+
+    def on_shown(self):
+        self.timer.stop()
+        if self.is_trimmed:
+            self.is_trimmed = False
+            self.rehydrated.emit()
@@ -0,0 +1,150 @@
+import faulthandler
+import logging
+import logging.handlers
+import os
+import re
+import threading
+import time
+from collections import Counter, deque
+
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+_THREAD_HEADER = re.compile(r"^(?:Current thread|Thread) (0x[0-9a-f]+).*$", re.MULTILINE)
+
+
+class StallWatchdog(QObject):
+    """
+    Watches the GUI event loop for stalls.
+
+    A heartbeat timer on the GUI thread records how late each tick fires.
+    Each tick re-arms faulthandler's traceback timer, whose C-level thread
+    needs no GIL, so the GUI thread's stack is dumped every
+    `threshold_ms + heartbeat_ms` while it is stuck, including inside a long
+    Qt call that holds the GIL. When the next tick arrives late, the stall
+    is logged with its duration and the most common of those stacks (up to
+    `samples_per_stall`). A periodic summary of lag percentiles goes to the
+    same size-bounded rotating log at `log_path`.
+
+    faulthandler has one such timer per process, so nothing else should use
+    dump_traceback_later while the watchdog runs. The raw dumps of a stall
+    that never ends stay in `log_path` + ".dump" for a post-mortem.
+    """
+    def __init__(self, log_path, threshold_ms=200, heartbeat_ms=100, samples_per_stall=5,
+                 summary_interval_s=300, max_log_bytes=512 * 1024, log_backups=2, parent=None):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self.heartbeat = heartbeat_ms / 1000
+        self.samples_per_stall = samples_per_stall
+        self.summary_interval = summary_interval_s
+        # Lags over this long are a suspended machine rather than a stall.
+        self.max_stall = 30.0
+
+        self.lags = deque(maxlen=4096)
+        self.stall_count = 0
+        self._last_beat = time.perf_counter()
+        self._next_summary = self._last_beat + self.summary_interval
+        self._main_thread_id = threading.main_thread().ident
+        self._running = False
+
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self.beat)
+
+        os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+        # faulthandler writes straight to the file descriptor, so no Python buffering.
+        self._dump = open(log_path + ".dump", "w+b", buffering=0)
+        self.log = logging.getLogger("chatbar.stalls")
+        self.log.setLevel(logging.INFO)
+        self.log.propagate = False
+        if not self.log.handlers:
+            handler = logging.handlers.RotatingFileHandler(
+                log_path, maxBytes=max_log_bytes, backupCount=log_backups, encoding="utf-8"
+            )
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.log.addHandler(handler)
+
+    def start(self):
+        self.resume()
+
+    def stop(self):
+        self.pause()
+
+    def pause(self):
+        """Stops the heartbeat and the traceback timer, e.g. while the window is idle."""
+        if not self._running:
+            return
+        self._running = False
+        self.timer.stop()
+        faulthandler.cancel_dump_traceback_later()
+        self._write_summary()
+
+    def resume(self):
+        if self._running:
+            return
+        self._running = True
+        self._clear_dumps()
+        self._last_beat = time.perf_counter()
+        self._arm()
+        self.timer.start(int(self.heartbeat * 1000))
+
+    def _arm(self):
+        faulthandler.dump_traceback_later(
+            self.threshold + self.heartbeat, repeat=True, file=self._dump
+        )
+
+    def beat(self):
+        """Heartbeat tick on the GUI thread: records how late it fired and re-arms the sampler."""
+        now = time.perf_counter()
+        self._arm()
+        lag = now - self._last_beat - self.heartbeat
+        self._last_beat = now
+        if lag < self.max_stall:
+            self.lags.append(max(0.0, lag))
+            if lag > self.threshold:
+                self._write_stall(lag, self._read_samples())
+        if self._dump.tell():
+            self._clear_dumps()
+        if now >= self._next_summary:
+            self._write_summary()
+            self._next_summary = now + self.summary_interval
+
+    def _clear_dumps(self):
+        self._dump.seek(0)
+        self._dump.truncate()
+
+    def _read_samples(self):
+        """Returns a Counter of the GUI thread's stacks in the dumps taken during the stall."""
+        self._dump.seek(0)
+        text = self._dump.read().decode("utf-8", "replace")
+        samples = Counter()
+        for dump in text.split("Timeout (")[1:]:
+            headers = list(_THREAD_HEADER.finditer(dump))
+            for i, header in enumerate(headers):
+                if int(header.group(1), 16) != self._main_thread_id:
+                    continue
+                end = headers[i + 1].start() if i + 1 < len(headers) else len(dump)
+                samples[dump[header.end():end].strip("\n")] += 1
+        return samples
+
+    def _write_stall(self, duration, samples):
+        self.stall_count += 1
+        lines = [f"STALL {duration * 1000:.0f} ms on the GUI thread, {sum(samples.values())} stack samples"]
+        for stack, count in samples.most_common(self.samples_per_stall):
+            lines.append(f"--- seen in {count} sample(s), most recent call first:\n{stack}")
+        self.log.info("\n".join(lines))
+
+    def _write_summary(self):
+        lags = sorted(self.lags)
+        self.lags.clear()
+        if not lags:
+            return
+
+        def pct(fraction):
+            return lags[min(len(lags) - 1, int(len(lags) * fraction))] * 1000
+
+        self.log.info(
+            f"SUMMARY event-loop lag over {len(lags)} beats: p50={pct(0.5):.1f} ms "
+            f"p95={pct(0.95):.1f} ms p99={pct(0.99):.1f} ms max={lags[-1] * 1000:.1f} ms, "
+            f"{self.stall_count} stalls"
+        )
+        self.stall_count = 0
@@ -0,0 +1,368 @@
+import functools
+import re
+import time
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtGui import QColor, QSyntaxHighlighter, QTextCharFormat, QTextFormat, QTextLayout
+
+# Per-language lexer rules. Token patterns are tried left to right in one
+# combined regex, so comments and strings win over keywords inside them.
+# "multiline" lists (start, end, colour) triples for constructs that span lines.
+LANGUAGES = {
+    "python": {
+        "keywords": "and as assert async await break class continue def del elif else except "
+                    "finally for from global if import in is lambda nonlocal not or pass raise "
+                    "return try while with yield None True False",
+        "builtins": "print len range open str int float list dict set tuple bool type isinstance "
+                    "enumerate zip map filter sorted sum min max super self",
+        "comment": r"#.*",
+        "multiline": [(r'"""', r'"""', "string"), (r"\'\'\'", r"\'\'\'", "string")],
+    },
+    "javascript": {
+        "keywords": "break case catch class const continue default delete do else export extends "
+                    "finally for function if import in instanceof let new return switch this throw "
+                    "try typeof var void while yield async await of null undefined true false "
+                    "interface type enum implements",
+        "builtins": "console document window Math JSON Promise Array Object String Number require",
+        "comment": r"//.*",
+        "multiline": [(r"/\*", r"\*/", "comment")],
+    },
+    "c": {
+        "keywords": "auto break case char const continue default do double else enum extern float "
+                    "for goto if inline int long register return short signed sizeof static struct "
+                    "switch typedef union unsigned void volatile while bool true false class "
+                    "namespace public private protected template typename virtual new delete using "
+                    "nullptr NULL",
+        "builtins": "printf scanf malloc free memcpy strlen fopen fclose fgets std cout cin endl",
+        "comment": r"//.*|^\s*#\s*\w+.*",
+        "multiline": [(r"/\*", r"\*/", "comment")],
+    },
+    "bash": {
+        "keywords": "if then else elif fi for while until do done case esac in function return "
+                    "export local readonly",
+        "builtins": "echo cd ls cat grep sed awk pip python git sudo mkdir rm cp mv source",
+        "comment": r"#.*",
+        "multiline": None,
+    },
+    "json": {
+        "keywords": "true false null",
+        "builtins": "",
+        "comment": None,
+        "multiline": None,
+    },
+    "sql": {
+        "keywords": "select from where insert into values update set delete create table drop alter "
+                    "join left right inner outer on group by order having limit and or not null as "
+                    "distinct index primary key SELECT FROM WHERE INSERT INTO VALUES UPDATE SET "
+                    "DELETE CREATE TABLE DROP ALTER JOIN LEFT RIGHT INNER OUTER ON GROUP BY ORDER "
+                    "HAVING LIMIT AND OR NOT NULL AS DISTINCT INDEX PRIMARY KEY",
+        "builtins": "count sum avg min max COUNT SUM AVG MIN MAX",
+        "comment": r"--.*",
+        "multiline": [(r"/\*", r"\*/", "comment")],
+    },
+}
+
+ALIASES = {
+    "py": "python", "python3": "python",
+    "js": "javascript", "ts": "javascript", "typescript": "javascript", "jsx": "javascript",
+    "tsx": "javascript", "java": "c", "cpp": "c", "c++": "c", "cs": "c", "csharp": "c",
+    "go": "c", "rust": "c", "h": "c", "hpp": "c",
+    "sh": "bash", "shell": "bash", "zsh": "bash", "console": "bash",
+}
+
+# Block states: -1 outside code. Inside a fence while streaming,
+# STRIDE * (language index + 1); after the markdown render,
+# RENDERED + STRIDE * index. Either is + (n + 1) while the language's n-th
+# multi-line construct is still open, so it closes on its own delimiter.
+LANGUAGE_IDS = ["plain"] + list(LANGUAGES)
+OUTSIDE_CODE = -1
+STRIDE = 4
+RENDERED = 1 << 16
+
+FENCE_PATTERN = re.compile(r"^\s*(```|~~~)\s*([\w+#-]*)")
+
+COLORS = {
+    "keyword": "#C586C0",
+    "builtin": "#4EC9B0",
+    "string": "#CE9178",
+    "comment": "#6A9955",
+    "number": "#B5CEA8",
+    "function": "#DCDCAA",
+    "fence": "#666666",
+}
+
+
+class Lexer:
+    """Compiled rules for one language."""
+    def __init__(self, rules):
+        groups = []
+        if rules.get("comment"):
+            groups.append(f"(?P<comment>{rules['comment']})")
+        groups.append(r"""(?P<string>"(?:[^"\\]|\\.)*"?|'(?:[^'\\]|\\.)*'?|`(?:[^`\\]|\\.)*`?)""")
+        if rules.get("keywords"):
+            groups.append(r"(?P<keyword>\b(?:" + "|".join(map(re.escape, rules["keywords"].split())) + r")\b)")
+        if rules.get("builtins"):
+            groups.append(r"(?P<builtin>\b(?:" + "|".join(map(re.escape, rules["builtins"].split())) + r")\b)")
+        groups.append(r"(?P<number>\b(?:0[xX][0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)\b)")
+        groups.append(r"(?P<function>\b[A-Za-z_]\w*(?=\s*\())")
+        self.tokens = re.compile("|".join(groups))
+
+        # Finds the next multi-line opener, skipping strings and line comments
+        # so a delimiter inside them does not open anything.
+        self.multiline = [(re.compile(end), colour) for _, end, colour in rules.get("multiline") or ()]
+        self.multiline_scan = None
+        if self.multiline:
+            openers = [f"(?P<m{i}>{start})" for i, (start, _, _) in enumerate(rules["multiline"])]
+            skipped = [groups[1].replace("?P<string>", "?:")]
+            if rules.get("comment"):
+                skipped.append(f"(?:{rules['comment']})")
+            self.multiline_scan = re.compile("|".join(openers + ["(?P<skip>" + "|".join(skipped) + ")"]))
+
+
+@functools.lru_cache(maxsize=None)
+def lexer_for(language):
+    """Returns the cached Lexer for a language name or alias, or None if unknown."""
+    language = ALIASES.get(language, language)
+    rules = LANGUAGES.get(language)
+    return Lexer(rules) if rules else None
+
+
+def language_id(language):
+    language = ALIASES.get(language.lower(), language.lower())
+    return LANGUAGE_IDS.index(language) if language in LANGUAGES else 0
+
+
+class CodeHighlighter(QSyntaxHighlighter):
+    """
+    Highlights code blocks in the response view, both while streaming and
+    after the final markdown render.
+
+    While streaming, the text is plain and fenced blocks are tracked through
+    QSyntaxHighlighter's per-block state, so each new chunk only re-highlights
+    the blocks it touched. Blocks over the per-pass `budget_ms` keep their
+    correct state but are coloured in later passes.
+
+    The final markdown render goes through render_markdown(), which detaches
+    the highlighter so Qt does not re-highlight every block at once, then
+    colours code blocks top-down in slices of `budget_ms`, recognising them by
+    their BlockCodeLanguage format property. The highlighter re-attaches as
+    soon as the text is replaced for the next response.
+    """
+    def __init__(self, document, budget_ms=4.0):
+        super().__init__(document)
+        self.budget = budget_ms / 1000
+        # Colours only: changing fonts here would make the layout disagree
+        # with ChatBarWindow.calculate_text_height, which measures the plain document.
+        self.formats = {}
+        for name, color in COLORS.items():
+            fmt = QTextCharFormat()
+            fmt.setForeground(QColor(color))
+            self.formats[name] = fmt
+
+        self._frame_start = None
+        self._pending = set()
+        self._drain_timer = QTimer(self)
+        self._drain_timer.setSingleShot(True)
+        self._drain_timer.timeout.connect(self._drain)
+
+        self._rendered_document = None
+        self._render_block = None
+        self._render_state = OUTSIDE_CODE
+        self._marking = False
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.timeout.connect(self._render_slice)
+
+    @property
+    def rendering(self):
+        """True while rendered code blocks are still being coloured."""
+        return self._render_block is not None
+
+    def render_markdown(self, view, text):
+        """
+        Replaces the text of `view` (a QTextEdit on this highlighter's
+        document) with rendered markdown, colouring its code blocks over as
+        many event-loop passes as the budget needs.
+        """
+        document = self.document() or self._rendered_document
+        self._over_budget()  # The budget for this pass includes the render itself.
+        self._stop_rendering()
+        self._pending.clear()
+        self._drain_timer.stop()
+        self.setDocument(None)
+        view.setMarkdown(text)
+
+        self._rendered_document = document
+        document.contentsChange.connect(self._on_rendered_change)
+        self._render_block = document.begin()
+        self._render_state = OUTSIDE_CODE
+        self._render_slice()
+
+    def _render_slice(self):
+        document = self._rendered_document
+        block = self._render_block
+        start = block.position()
+        end = start
+        while block.isValid() and not self._over_budget():
+            self._render_state = self._colour_rendered_block(block, self._render_state)
+            end = block.position() + block.length()
+            block = block.next()
+
+        if end > start:
+            # Our own repaint request; _on_rendered_change ignores it.
+            self._marking = True
+            document.markContentsDirty(start, end - start)
+            self._marking = False
+        if block.isValid():
+            self._render_block = block
+            self._render_timer.start(0)
+        else:
+            self._render_block = None
+
+    def _colour_rendered_block(self, block, previous):
+        """Colours one block of rendered markdown. Returns its state."""
+        block_format = block.blockFormat()
+        if not block_format.hasProperty(QTextFormat.BlockCodeFence):
+            return OUTSIDE_CODE
+        lang_id = language_id(block_format.stringProperty(QTextFormat.BlockCodeLanguage))
+        lexer = lexer_for(LANGUAGE_IDS[lang_id])
+        base = RENDERED + STRIDE * lang_id
+        if lexer is None:
+            return base
+        text = block.text()
+        open_kind = previous - base if base < previous < base + STRIDE else 0
+        ranges = []
+        for start, length, fmt in self._format_ranges(text, lexer, open_kind):
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = fmt
+            ranges.append(format_range)
+        block.layout().setFormats(ranges)
+        return base + self._multiline_spans(text, lexer, open_kind)
+
+    def _on_rendered_change(self, position, removed, added):
+        if self._marking:
+            return
+        # The rendered answer is being replaced: highlight the new text as it streams.
+        document = self._rendered_document
+        self._stop_rendering()
+        self.setDocument(document)
+
+    def _stop_rendering(self):
+        self._render_timer.stop()
+        self._render_block = None
+        if self._rendered_document is not None:
+            self._rendered_document.contentsChange.disconnect(self._on_rendered_change)
+            self._rendered_document = None
+
+    def _over_budget(self):
+        now = time.perf_counter()
+        if self._frame_start is None:
+            # First block of this event-loop pass; the frame ends when control returns.
+            self._frame_start = now
+            QTimer.singleShot(0, self._end_frame)
+        return now - self._frame_start > self.budget
+
+    def _end_frame(self):
+        self._frame_start = None
+
+    def _drain(self):
+        document = self.document()
+        while self._pending and not self._over_budget():
+            block = document.findBlockByNumber(self._pending.pop())
+            if block.isValid():
+                self.rehighlightBlock(block)
+        if self._pending:
+            self._drain_timer.start(0)
+
+    def highlightBlock(self, text):
+        previous = self.previousBlockState()
+        block_format = self.currentBlock().blockFormat()
+        if block_format.hasProperty(QTextFormat.BlockCodeFence):
+            # Rendered markdown: the fences are gone, the language is a block property.
+            lang_id = language_id(block_format.stringProperty(QTextFormat.BlockCodeLanguage))
+            base = RENDERED + STRIDE * lang_id
+            open_kind = previous - base if base < previous < base + STRIDE else 0
+        else:
+            fence = FENCE_PATTERN.match(text)
+            if not STRIDE <= previous < RENDERED:
+                if fence:
+                    # Opening fence: the following lines are code in this language.
+                    self.setCurrentBlockState(STRIDE * (language_id(fence.group(2)) + 1))
+                    self.setFormat(0, len(text), self.formats["fence"])
+                else:
+                    self.setCurrentBlockState(OUTSIDE_CODE)
+                return
+            if fence and not fence.group(2):
+                # A bare fence closes the block whatever the code left open.
+                self.setCurrentBlockState(OUTSIDE_CODE)
+                self.setFormat(0, len(text), self.formats["fence"])
+                return
+            lang_id = previous // STRIDE - 1
+            base = STRIDE * (lang_id + 1)
+            open_kind = previous % STRIDE
+
+        lexer = lexer_for(LANGUAGE_IDS[lang_id])
+        if lexer is None:
+            self.setCurrentBlockState(base)
+            return
+
+        # The state is always kept exact so later blocks stay correct;
+        # only the colouring is deferred when over budget.
+        self.setCurrentBlockState(base + self._multiline_spans(text, lexer, open_kind))
+        number = self.currentBlock().blockNumber()
+        if self._over_budget():
+            self._pending.add(number)
+            if not self._drain_timer.isActive():
+                self._drain_timer.start(0)
+            return
+        self._pending.discard(number)
+        for start, length, fmt in self._format_ranges(text, lexer, open_kind):
+            self.setFormat(start, length, fmt)
+
+    def _multiline_spans(self, text, lexer, open_kind, ranges=None):
+        """
+        Walks the multi-line comment/string delimiters in `text`, starting
+        inside construct `open_kind` (1-based, 0 for none). Returns the kind
+        still open at the end of the line; with `ranges`, appends the
+        colouring of those spans to it and returns the (start, end) spans
+        outside them instead.
+        """
+        paint = ranges is not None
+        if not lexer.multiline:
+            return [(0, len(text))] if paint else 0
+        outside = []
+        pos = search_from = 0
+        while True:
+            if open_kind:
+                end_pattern, colour = lexer.multiline[open_kind - 1]
+                end = end_pattern.search(text, search_from)
+                stop = end.end() if end else len(text)
+                if paint:
+                    ranges.append((pos, stop - pos, self.formats[colour]))
+                if not end:
+                    break
+                pos = search_from = stop
+                open_kind = 0
+            else:
+                start = lexer.multiline_scan.search(text, pos)
+                while start and start.lastgroup == "skip":
+                    start = lexer.multiline_scan.search(text, start.end())
+                stop = start.start() if start else len(text)
+                if paint:
+                    outside.append((pos, stop))
+                if not start:
+                    break
+                pos, search_from = start.start(), start.end()
+                open_kind = int(start.lastgroup[1:]) + 1
+        return outside if paint else open_kind
+
+    def _format_ranges(self, text, lexer, open_kind):
+        """Returns the (start, length, format) ranges colouring one line of code."""
+        formats = self.formats
+        ranges = []
+        for start, end in self._multiline_spans(text, lexer, open_kind, ranges):
+            for match in lexer.tokens.finditer(text, start, end):
+                ranges.append((match.start(), match.end() - match.start(), formats[match.lastgroup]))
+        return ranges
@@ -3,9 +3,11 @@ from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QLineEdit,
                              QTextEdit, QPushButton, QGraphicsDropShadowEffect,
                              QGraphicsOpacityEffect)
 from PyQt5.QtCore import (Qt, QPropertyAnimation, QEasingCurve, QTimer, 
-                          QSequentialAnimationGroup, pyqtProperty, QRect)
+                          QSequentialAnimationGroup, pyqtProperty, pyqtSignal, QRect)
 from PyQt5.QtGui import QFont, QColor, QIcon, QPainter, QLinearGradient, QTextDocument
 
+from ui.syntax_highlighter import CodeHighlighter
+
 # from .edge_lighting_widget import EdgeLightingWidget
 
 class EdgeLightingWidget(QWidget):
@@ -108,6 +110,9 @@ class ShimmerWidget(QWidget):
         self.hide()
 
 class ChatBarWindow(QWidget):
+    shown = pyqtSignal()
+    hidden = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         
@@ -171,12 +176,17 @@ class ChatBarWindow(QWidget):
         # Response view with proper text wrapping
         self.response_view = QTextEdit(self)
         self.response_view.setReadOnly(True)
+        # Read-only, so streamed inserts need no undo history.
+        self.response_view.setUndoRedoEnabled(False)
         self.response_view.setVisible(False)
         self.response_view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.response_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.response_view.setWordWrapMode(True)  # Enable word wrapping
         self.response_view.setLineWrapMode(QTextEdit.WidgetWidth)  # Wrap at widget width
         self.response_view.textChanged.connect(self.on_text_changed)
+
+        # Colours fenced code blocks incrementally as chunks arrive
+        self.highlighter = CodeHighlighter(self.response_view.document())
         
         # Set initial minimum size
         self.response_view.setMinimumHeight(self.MIN_RESPONSE_HEIGHT)
@@ -307,7 +317,7 @@ class ChatBarWindow(QWidget):
         self.copy_button.setDisabled(False)
         # Convert to markdown after streaming is complete
         plain_text = self.response_view.toPlainText()
-        self.response_view.setMarkdown(plain_text)
+        self.highlighter.render_markdown(self.response_view, plain_text)
         # Final height adjustment after markdown conversion
         QTimer.singleShot(50, self.adjust_height)
 
@@ -405,9 +415,29 @@ class ChatBarWindow(QWidget):
     def showEvent(self, event):
         """Handle show event to ensure proper sizing"""
         super().showEvent(event)
+        self.shown.emit()
         if self.response_view.isVisible():
             QTimer.singleShot(50, self.adjust_height)
 
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.hidden.emit()
+
+    def release_resources(self):
+        """Drops document, layout and animation state while the window is idle and hidden."""
+        self.thinking_animation_timer.stop()
+        self.edge_lighting.stop_animation()
+        self.shimmer.stop()
+        if self.animation:
+            self.animation.stop()
+            self.animation = None
+
+        # Clearing the document frees its blocks and their text layouts.
+        document = self.response_view.document()
+        document.clear()
+        document.clearUndoRedoStacks()
+        self.input_bar.clear()
+
     def load_stylesheet(self):
         try:
             with open("ui/styles.qss", "r") as f:
@@ -0,0 +1,298 @@
+import multiprocessing
+import socket
+import threading
+
+from PyQt5.QtCore import QMetaObject, QObject, QSocketNotifier, Qt, pyqtSignal, pyqtSlot
+
+import config
+from api.circuit_breaker import CircuitBreaker, probe_server
+from api.process_worker import run_client_process
+from api.shm_ring import CHUNK, END, ChunkRing
+
+def create_retriever(breaker=None):
+    """Builds the document retriever and starts indexing in the background."""
+    from retrieval.embedder import Embedder
+    from retrieval.retriever import Indexer, Retriever
+    from retrieval.store import VectorStore
+
+    store = VectorStore(config.RETRIEVAL_INDEX)
+    # Indexing embeds large batches in the background and may wait on the server;
+    # the prompt's embedding sits in front of every request and must not.
+    index_embedder = Embedder(
+        base_url=config.BASE_URL, model=config.EMBEDDING_MODEL,
+        connect_timeout=config.CONNECT_TIMEOUT,
+    )
+    query_embedder = Embedder(
+        base_url=config.BASE_URL, model=config.EMBEDDING_MODEL,
+        connect_timeout=config.CONNECT_TIMEOUT, timeout=config.RETRIEVAL_TIMEOUT,
+    )
+    indexer = Indexer(store, index_embedder, config.RETRIEVAL_DIRS)
+    indexer.refresh()
+    return Retriever(
+        store, query_embedder, indexer,
+        top_k=config.RETRIEVAL_TOP_K, token_budget=config.RETRIEVAL_TOKEN_BUDGET,
+        breaker=breaker,
+    )
+
+def create_client():
+    """Builds the AI client selected by config.TRANSPORT."""
+    if config.REPLAY:
+        from api.recording import ReplayClient
+        return ReplayClient(config.REPLAY, speed=config.REPLAY_SPEED)
+
+    breaker = CircuitBreaker(
+        probe=lambda: probe_server(config.BASE_URL, config.CONNECT_TIMEOUT),
+        failure_threshold=config.BREAKER_THRESHOLD,
+        probe_interval=config.BREAKER_PROBE_INTERVAL,
+    )
+    options = dict(
+        base_url=config.BASE_URL,
+        connect_timeout=config.CONNECT_TIMEOUT,
+        first_token_timeout=config.FIRST_TOKEN_TIMEOUT,
+        chunk_timeout=config.CHUNK_TIMEOUT,
+        breaker=breaker,
+        retriever=create_retriever(breaker) if config.RETRIEVAL_DIRS else None,
+    )
+    if config.TRANSPORT == "raw":
+        from api.raw_stream import RawStreamClient
+        client = RawStreamClient(**options)
+    else:
+        from api.client import LocalAIClient
+        client = LocalAIClient(**options)
+
+    if config.SMALL_MODEL and config.LARGE_MODEL:
+        from api.router import CascadeClient
+        client = CascadeClient(
+            client, config.SMALL_MODEL, config.LARGE_MODEL, escalate=config.ESCALATE
+        )
+
+    if config.RECORD_DIR:
+        from api.recording import StreamRecorder
+        client = StreamRecorder(client, config.RECORD_DIR)
+    return client
+
+class ChunkCoalescer(QObject):
+    """
+    Hands chunks from a worker thread to the thread that created it, joining
+    the chunks that arrive before that thread gets to them into one signal.
+    """
+
+    new_chunk = pyqtSignal(str)
+
+    def __init__(self):
+        super().__init__()
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def push(self, chunk):
+        """Queues a chunk for delivery. Safe to call from any thread."""
+        with self._lock:
+            self._pending.append(chunk)
+            if len(self._pending) > 1:
+                # A flush is already scheduled and will pick this chunk up.
+                return
+        QMetaObject.invokeMethod(self, "flush", Qt.QueuedConnection)
+
+    @pyqtSlot()
+    def flush(self):
+        with self._lock:
+            text = "".join(self._pending)
+            self._pending = []
+        if text:
+            self.new_chunk.emit(text)
+
+class ChatWorker(QObject):
+    """
+    Handles API requests in a separate thread.
+
+    With `coalesce`, chunks that arrive while the GUI thread is busy are
+    emitted together, as ProcessChatWorker does, so a burst costs one text
+    insertion and one relayout instead of one per token. Create the worker
+    on the GUI thread before moving it to its own thread.
+    """
+
+    new_chunk = pyqtSignal(str)
+    stream_finished = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, client_factory=create_client, coalesce=True):
+        super().__init__()
+        self.client = client_factory()
+        self.coalescer = None
+        if coalesce:
+            # Unparented so it stays on this thread when the worker is moved.
+            self.coalescer = ChunkCoalescer()
+            self.coalescer.new_chunk.connect(self.new_chunk, Qt.DirectConnection)
+
+    def backend_available(self):
+        """Returns False while the client's circuit breaker is open. Safe to call from any thread."""
+        return self.client.breaker.allow_request()
+
+    @pyqtSlot(str)
+    def process_text(self, text):
+        """Sends text to the server and emits the response chunks."""
+        emit = self.coalescer.push if self.coalescer else self.new_chunk.emit
+        try:
+            for chunk in self.client.get_streaming_response(text):
+                emit(chunk)
+            self.stream_finished.emit()
+        except Exception as e:
+            self.error.emit(f"An unexpected error occurred: {e}")
+
+    @pyqtSlot()
+    def release_idle(self):
+        """Drops the client's idle pooled connections and pauses breaker probing."""
+        self.client.release_idle()
+        self.client.breaker.pause()
+
+    @pyqtSlot()
+    def rehydrate(self):
+        """Resumes breaker probing after release_idle()."""
+        self.client.breaker.resume()
+
+    @pyqtSlot()
+    def shutdown(self):
+        """Stops the client's background indexing so the app can exit promptly."""
+        self.client.shutdown()
+
+class ProcessChatWorker(QObject):
+    """
+    Runs the AI client in a separate process so that parsing and network work
+    never hold the GUI process's GIL.
+
+    Chunks arrive through a shared-memory ChunkRing. The network process pokes
+    a socket after each write, and a QSocketNotifier on the GUI side drains the
+    ring from the event loop, so no extra thread runs in the GUI process.
+    Exposes the same signals and slot as ChatWorker and lives on the GUI thread.
+
+    If the network process dies, a request in flight ends with `error` and
+    the next prompt starts a new process.
+    """
+
+    new_chunk = pyqtSignal(str)
+    stream_finished = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, client_factory=create_client, ring_size=1 << 20):
+        super().__init__()
+        self.client_factory = client_factory
+        self.ring_size = ring_size
+        self.in_flight = 0
+        self.process = None
+        self._start_process()
+
+    def _start_process(self):
+        """Starts the network process with a fresh ring, pipe and notifier socket."""
+        self.ring = ChunkRing(size=self.ring_size)
+        self.notify_reader, notify_writer = socket.socketpair()
+        self.notify_reader.setblocking(False)
+        self.requests, child_requests = multiprocessing.Pipe()
+
+        self.process = multiprocessing.Process(
+            target=run_client_process,
+            args=(child_requests, self.ring.name, notify_writer, self.client_factory),
+            name="ChatBarNetwork",
+            daemon=True,
+        )
+        self.process.start()
+        notify_writer.close()
+        child_requests.close()
+
+        self.notifier = QSocketNotifier(self.notify_reader.fileno(), QSocketNotifier.Read, self)
+        self.notifier.activated.connect(self.drain)
+
+    def backend_available(self):
+        """
+        The circuit breaker lives in the network process, which answers
+        immediately while it is open, so requests are always forwarded.
+        """
+        return True
+
+    @pyqtSlot(str)
+    def process_text(self, text):
+        """Forwards text to the network process, restarting it if it has exited."""
+        try:
+            if self.process is None or not self.process.is_alive():
+                if self.process is not None:
+                    self._stop_process()
+                self._start_process()
+            self.requests.send(("prompt", text))
+        except OSError as e:
+            self.error.emit(f"An unexpected error occurred: could not start the network process: {e}")
+            return
+        self.in_flight += 1
+
+    @pyqtSlot()
+    def release_idle(self):
+        """Asks the network process to drop idle connections, pause breaker probing and collect garbage."""
+        self._send(("release_idle",))
+
+    @pyqtSlot()
+    def rehydrate(self):
+        """Asks the network process to resume breaker probing."""
+        self._send(("rehydrate",))
+
+    def _send(self, message):
+        if self.process is not None and self.process.is_alive():
+            try:
+                self.requests.send(message)
+            except OSError:
+                pass
+
+    def drain(self):
+        """Emits every record waiting in the ring."""
+        exited = False
+        try:
+            while True:
+                if not self.notify_reader.recv(4096):
+                    # The network process has exited.
+                    exited = True
+                    break
+        except BlockingIOError:
+            pass
+
+        # Chunks that arrived together are emitted as one, so a burst costs one
+        # text insertion and one relayout instead of one per token.
+        pending = []
+        for kind, text in self.ring.read_all():
+            if kind == CHUNK:
+                pending.append(text)
+                continue
+            if pending:
+                self.new_chunk.emit("".join(pending))
+                pending = []
+            self.in_flight = max(0, self.in_flight - 1)
+            if kind == END:
+                self.stream_finished.emit()
+            else:
+                self.error.emit(text)
+        if pending:
+            self.new_chunk.emit("".join(pending))
+
+        if exited:
+            self._stop_process()
+            if self.in_flight:
+                # The request will never finish; end it so the input bar is released.
+                self.in_flight = 0
+                self.error.emit("An unexpected error occurred: the network process has exited.")
+
+    def shutdown(self):
+        """Stops the network process and frees the shared memory."""
+        if self.process is not None:
+            self._stop_process()
+
+    def _stop_process(self):
+        """Stops the current network process and frees its ring and sockets."""
+        self.notifier.setEnabled(False)
+        self.notifier.deleteLater()
+        try:
+            self.requests.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.requests.close()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process = None
+        self.notify_reader.close()
+        self.ring.close()